@@ -0,0 +1,237 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Parser throughput benchmarks over the bundled model corpus.
+
+Every file is parsed in a fresh worker process, so that the peak resident
+set size of each file is measured on its own. For each file the fastest of
+``--repeat`` parses is reported, together with the throughput in MB/s and
+rows/s. ``peak_rss`` is the peak resident set size of the worker, and
+``base_rss`` its size after importing the parser, before any parsing. For
+CSI files, the cost of parsing each table is also reported.
+
+Usage
+=====
+
+    python benchmarks/bench_parse.py [--corpus NAME ...] [--repeat N] [-o results.json]
+    python benchmarks/bench_parse.py --compare old.json new.json
+
+The JSON output can be kept for each release and compared with
+``--compare``, which prints the change in throughput of every corpus.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import resource
+import importlib
+import multiprocessing
+from pathlib import Path
+
+ROOT   = Path(__file__).resolve().parents[1]
+MODELS = ROOT/"models"
+
+# name: (directory, format, glob patterns)
+CORPORA = {
+    "Analysis":    ("Analysis",    "csi", ("*.s2k", "*.b2k")),
+    "Bridges":     ("Bridges",     "csi", ("*.s2k", "*.b2k")),
+    "csi/painter": ("csi/painter", "csi", ("*.s2k", "*.b2k")),
+    "Abaqus":      ("Abaqus",      "inp", ("*.inp",)),
+    "abaqus":      ("abaqus",      "inp", ("*.inp",)),
+    "cae":         ("cae",         "inp", ("*.inp",)),
+}
+
+PARSERS = {
+    "csi": "openbim.csi.parse",
+    "inp": "openbim.inp.parser",
+}
+
+
+def _files(corpus):
+    directory, format, patterns = CORPORA[corpus]
+    files = set()
+    for pattern in patterns:
+        files.update((MODELS/directory).rglob(pattern))
+    return format, sorted(files)
+
+
+def _peak_rss()->int:
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak*1024
+
+
+def _count_inp(node)->int:
+    return len(node.data) + sum(_count_inp(child) for child in node.children)
+
+
+def _bench_csi(path, repeat):
+    from openbim.csi.parse import load
+
+    seconds = min(_timed(load, path, cache=False)[0] for _ in range(repeat))
+    _, csi  = _timed(load, path, cache=False)
+
+    # Cost of each table, parsed on its own from a lazy index
+    tables = {}
+    for _ in range(repeat):
+        lazy = load(path, lazy=True, cache=False)
+        for name in list(lazy):
+            elapsed, rows = _timed(lazy.__getitem__, name)
+            if name not in tables or elapsed < tables[name]["seconds"]:
+                tables[name] = {"rows": len(rows), "seconds": elapsed}
+        lazy.close()
+
+    return seconds, sum(len(rows) for rows in csi.values()), tables
+
+
+def _bench_inp(path, repeat):
+    from openbim.inp.parser import load
+
+    seconds = min(_timed(load, path)[0] for _ in range(repeat))
+    _, ast  = _timed(load, path)
+    return seconds, _count_inp(ast), None
+
+
+def _timed(func, *args, **kwds):
+    start = time.perf_counter()
+    value = func(*args, **kwds)
+    return time.perf_counter() - start, value
+
+
+def _run(corpus, format, path, repeat):
+    """
+    Benchmark one file; runs in a worker process.
+    """
+    result = {
+        "corpus": corpus,
+        "path":   str(Path(path).relative_to(ROOT)),
+        "format": format,
+        "bytes":  os.path.getsize(path),
+    }
+    try:
+        # Imports are not counted towards the cost of parsing
+        importlib.import_module(PARSERS[format])
+        base_rss = _peak_rss()
+
+        bench = _bench_csi if format == "csi" else _bench_inp
+        seconds, rows, tables = bench(path, repeat)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result.update({
+        "seconds":    seconds,
+        "rows":       rows,
+        "mb_per_s":   result["bytes"]/2**20/seconds if seconds else None,
+        "rows_per_s": rows/seconds if seconds else None,
+        "peak_rss":   _peak_rss(),
+        "base_rss":   base_rss,
+    })
+    if tables is not None:
+        result["tables"] = tables
+    return result
+
+
+def _summarize(files):
+    corpora = {}
+    for result in files:
+        summary = corpora.setdefault(result["corpus"], {
+            "files": 0, "errors": 0, "bytes": 0, "rows": 0, "seconds": 0.0, "peak_rss": 0
+        })
+        summary["files"] += 1
+        if "error" in result:
+            summary["errors"] += 1
+            continue
+        summary["bytes"]   += result["bytes"]
+        summary["rows"]    += result["rows"]
+        summary["seconds"] += result["seconds"]
+        summary["peak_rss"] = max(summary["peak_rss"], result["peak_rss"])
+
+    for summary in corpora.values():
+        seconds = summary["seconds"]
+        summary["mb_per_s"]   = summary["bytes"]/2**20/seconds if seconds else None
+        summary["rows_per_s"] = summary["rows"]/seconds if seconds else None
+
+    return corpora
+
+
+def run(corpora=None, repeat: int=3, verbose: bool=True)->dict:
+    """
+    Benchmark the parsers over the named ``corpora`` (default: all of
+    ``CORPORA``) and return the results as a JSON-serializable dictionary.
+    """
+    if corpora is None:
+        corpora = list(CORPORA)
+
+    # One process per file, so peak RSS is not shared between files
+    context = multiprocessing.get_context("spawn")
+
+    files = []
+    with context.Pool(1, maxtasksperchild=1) as pool:
+        for corpus in corpora:
+            format, paths = _files(corpus)
+            for path in paths:
+                result = pool.apply(_run, (corpus, format, str(path), repeat))
+                files.append(result)
+                if verbose:
+                    _print(result)
+
+    return {
+        "python":   platform.python_version(),
+        "platform": platform.platform(),
+        "machine":  platform.machine(),
+        "repeat":   repeat,
+        "corpora":  _summarize(files),
+        "files":    files,
+    }
+
+
+def _print(result):
+    if "error" in result:
+        print(f"{result['path']:<60}  {result['error']}", file=sys.stderr)
+        return
+    print(f"{result['path']:<60} {result['mb_per_s']:8.2f} MB/s {result['rows_per_s']:10.0f} rows/s"
+          f" {result['peak_rss']/2**20:8.1f} MB", file=sys.stderr)
+
+
+def compare(old: dict, new: dict):
+    """
+    Print the throughput of each corpus in ``new`` relative to ``old``.
+    """
+    print(f"{'corpus':<14} {'old MB/s':>10} {'new MB/s':>10} {'speedup':>8} {'old RSS':>9} {'new RSS':>9}")
+    for corpus, b in new["corpora"].items():
+        a = old["corpora"].get(corpus, None)
+        if a is None or not a["mb_per_s"] or not b["mb_per_s"]:
+            continue
+        print(f"{corpus:<14} {a['mb_per_s']:10.2f} {b['mb_per_s']:10.2f} {b['mb_per_s']/a['mb_per_s']:7.2f}x"
+              f" {a['peak_rss']/2**20:8.1f}M {b['peak_rss']/2**20:8.1f}M")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--corpus", action="append", choices=list(CORPORA),
+                        help="corpus to benchmark (repeatable; default: all)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="number of parses of each file; the fastest is reported")
+    parser.add_argument("-o", "--output", help="write JSON results to this file (default: stdout)")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"),
+                        help="compare two JSON result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as a, open(args.compare[1]) as b:
+            compare(json.load(a), json.load(b))
+        sys.exit()
+
+    results = run(args.corpus, repeat=args.repeat)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
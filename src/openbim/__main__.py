@@ -1,5 +1,7 @@
 import sys
 from openbim import csi, inp
+from openbim.ir import emit
+from openbim.export import dump_json
 
 if __name__ == "__main__":
 
@@ -10,16 +12,29 @@ if __name__ == "__main__":
         obj = lib.load(file_name)
     else:
         lib = csi
-        with open(file_name, "r") as f:
-            obj = lib.load(f)
+        # Repeated runs on the same file reuse the parsed tables
+        obj = lib.load(file_name, cache=csi.cache.enabled(default=True))
 
 
-    model = lib.create_model(obj, verbose=True)
+    if sys.argv[1] == "-C" and lib is csi:
+        # The OpenSees model is only created if the JSON cannot be
+        # written directly
+        ir, _ = lib.create_ir(obj, verbose=True)
+        model = None
+    else:
+        model = lib.create_model(obj, verbose=True)
 
     print("Created model")
 
     if sys.argv[1] == "-C":
         # Convert
+        if model is None:
+            try:
+                dump_json(ir, sys.stdout)
+                sys.exit()
+            except NotImplementedError:
+                import opensees.openseespy as ops
+                model = emit(ir, ops.Model(ndm=ir.ndm, ndf=ir.ndf))
         model.print("-json")
 
     elif sys.argv[1] == "-E":
@@ -0,0 +1,118 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Transparent reading and writing of compressed model files.
+
+Files ending in ``.gz``, ``.xz`` or ``.zst`` are decompressed on the fly
+while they are read (and compressed while they are written), so they never
+need to be extracted to disk. ``.zst`` files require Python 3.14 or the
+``zstandard`` package.
+"""
+import io
+import os
+
+SUFFIXES = (".gz", ".xz", ".zst")
+
+
+def codec(file):
+    """
+    Return the compression suffix of path ``file``, or None if ``file`` is
+    not a path to a compressed file.
+    """
+    if not isinstance(file, (str, os.PathLike)):
+        return None
+
+    name = os.fspath(file)
+    for suffix in SUFFIXES:
+        if name.endswith(suffix):
+            return suffix
+    return None
+
+
+def _open_zstd(file, mode):
+    try:
+        from compression import zstd
+        return zstd.open(file, mode)
+    except ImportError:
+        pass
+
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(".zst files require the zstandard package") from None
+
+    return zstandard.open(file, mode)
+
+
+def open_binary(file, mode: str="rb"):
+    """
+    Open ``file`` for reading (or, with ``mode="wb"``, writing) bytes,
+    decompressing (or compressing) it if needed.
+    """
+    suffix = codec(file)
+    if suffix == ".gz":
+        import gzip
+        return gzip.open(file, mode)
+    elif suffix == ".xz":
+        import lzma
+        return lzma.open(file, mode)
+    elif suffix == ".zst":
+        return _open_zstd(file, mode)
+    return open(file, mode)
+
+
+def open_text(file, encoding: str=None, mode: str="r", newline: str=None):
+    """
+    Open ``file`` for reading (or, with ``mode="w"``, writing) text,
+    decompressing (or compressing) it if needed. Newlines are translated
+    as by the built-in ``open``.
+    """
+    if codec(file) is None:
+        return open(file, mode, encoding=encoding, newline=newline)
+    return io.TextIOWrapper(open_binary(file, mode + "b"), encoding=encoding, newline=newline)
+
+
+class Stream:
+    """
+    Read slices of the decompressed contents of a file, as ``data[start:stop]``.
+
+    Reading forward through the file only decompresses each part once. A
+    slice that starts before the current position reopens the file, since
+    not every codec can seek backward.
+    """
+    def __init__(self, file):
+        self._file   = file
+        self._stream = open_binary(file)
+        self._pos    = 0
+
+    def _seek(self, pos):
+        if pos < self._pos:
+            self._stream.close()
+            self._stream = open_binary(self._file)
+            self._pos = 0
+
+        while self._pos < pos:
+            chunk = self._stream.read(min(pos - self._pos, 1 << 20))
+            if not chunk:
+                break
+            self._pos += len(chunk)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice) or key.step is not None:
+            raise TypeError("Stream only supports contiguous slices")
+
+        start = key.start or 0
+        self._seek(start)
+        if key.stop is None:
+            data = self._stream.read()
+        else:
+            data = self._stream.read(max(key.stop - start, 0))
+        self._pos += len(data)
+        return data
+
+    def close(self):
+        self._stream.close()
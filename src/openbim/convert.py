@@ -1,6 +1,12 @@
 import re
+import sys
+from array import array
 from collections import defaultdict
 
+import numpy as np
+
+from .diagnostics import Diagnostics
+
 RE = {
     "joint_key": re.compile("Joint[0-9]")
 }
@@ -14,35 +20,168 @@ TYPES = {
     }
 }
 
-class Converter:
+class TagMap:
+    """
+    Bidirectional map between the names of one kind of model object (e.g.
+    CSI ``Joint``) and the tags of the OpenSees objects created for them
+    (e.g. ``node``).
+
+    Names are interned and stored once in a list; tags are stored in a
+    contiguous integer array in the same order, which ``tags.array``
+    copies into a NumPy array in one step. Both ``tags[name]`` and
+    ``tags.name(tag)`` are constant time. Tags that fall in a compact range
+    (as produced by the ``Converter`` counters) are inverted through an
+    array of positions; other tags fall back to a dictionary.
+    """
     def __init__(self):
-        self._log = []
-        self._csi_names = {
-            # Abaqus
-            "Material": {
-                "material": {},
-                "uniaxial": {}
-            },
-            # CSI
-            "Joint": {
-                "node": {
-                    # 1:    1,
-                    # "P2": 2,
-                    # 3:    3
-                },
-            },
-            "Shell": {"element": {}},
-            "Link":  {"element": {}},
-            "Frame": {"element": {}},
-            "AnalSect": {
-                "section": {},
-                "integration": {}
-            },
-            "ShellSection": {
-                "section": {}
+        self._names    = []
+        self._tags     = array("q")
+        self._position = {}
+        # Inverse of _tags: _slots[tag - _offset] is the position of tag
+        self._offset   = None
+        self._slots    = array("q")
+        self._sparse   = None
+
+    def add(self, name, tag: int)->int:
+        """
+        Map ``name`` to ``tag`` and return ``tag``. If ``name`` is already
+        mapped, its existing tag is returned instead.
+        """
+        if name in self._position:
+            return self._tags[self._position[name]]
+
+        if type(name) is str:
+            name = sys.intern(name)
+
+        position = len(self._names)
+        self._names.append(name)
+        self._tags.append(tag)
+        self._position[name] = position
+        # Tags from the Converter counters are usually consecutive
+        if self._offset is not None and tag - self._offset == len(self._slots) \
+                and self._sparse is None:
+            self._slots.append(position)
+        else:
+            self._invert(tag, position)
+        return tag
+
+    def _invert(self, tag, position):
+        if self._sparse is None:
+            if self._offset is None:
+                self._offset = tag
+
+            i = tag - self._offset
+            if i == len(self._slots):
+                self._slots.append(position)
+                return
+
+            elif 0 <= i < 2*len(self._names) + 1024:
+                if i >= len(self._slots):
+                    self._slots.extend([-1]*(i + 1 - len(self._slots)))
+                if self._slots[i] < 0:
+                    self._slots[i] = position
+                return
+
+            # Tags are too spread out for an array
+            self._sparse = {
+                t + self._offset: p for t, p in enumerate(self._slots) if p >= 0
             }
-        }
-        self._ops_count = {
+
+        self._sparse.setdefault(tag, position)
+
+    def add_many(self, names, first: int)->int:
+        """
+        Map each of ``names`` that is not mapped yet to consecutive tags
+        starting at ``first``, and return the number of tags used.
+        """
+        position = self._position
+        new = list(dict.fromkeys(
+            sys.intern(name) if type(name) is str else name
+            for name in names if name not in position
+        ))
+        if not new:
+            return 0
+
+        start = len(self._names)
+        self._names.extend(new)
+        self._tags.extend(range(first, first + len(new)))
+        position.update(zip(new, range(start, start + len(new))))
+
+        if self._offset is None:
+            self._offset = first
+
+        if self._sparse is None and first - self._offset == len(self._slots):
+            self._slots.extend(range(start, start + len(new)))
+        else:
+            for i, name in enumerate(new):
+                self._invert(first + i, start + i)
+        return len(new)
+
+    def lookup(self, names, default: int=-1)->np.ndarray:
+        """
+        Return an array with the tag of each of ``names``, or ``default``
+        for names that are not mapped.
+        """
+        position = self._position
+        index = np.fromiter((position.get(name, -1) for name in names),
+                            dtype=np.int64)
+        tags = np.append(np.array(self._tags, dtype=np.int64), default)
+        # Position -1 selects the default appended at the end
+        return tags[index]
+
+    def get(self, name, default=None)->int:
+        position = self._position.get(name, None)
+        if position is None:
+            return default
+        return self._tags[position]
+
+    def name(self, tag: int, default=None):
+        """
+        Return the name that was mapped to ``tag``, or ``default``.
+        """
+        if self._sparse is not None:
+            position = self._sparse.get(tag, -1)
+        elif self._offset is not None and 0 <= tag - self._offset < len(self._slots):
+            position = self._slots[tag - self._offset]
+        else:
+            position = -1
+        return self._names[position] if position >= 0 else default
+
+    def names(self)->list:
+        return list(self._names)
+
+    @property
+    def array(self)->np.ndarray:
+        """
+        The tags of all names, in the order they were added.
+        """
+        return np.array(self._tags, dtype=np.int64)
+
+    def items(self):
+        return zip(self._names, self._tags)
+
+    def __getitem__(self, name)->int:
+        return self._tags[self._position[name]]
+
+    def __contains__(self, name):
+        return name in self._position
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __repr__(self):
+        return f"<TagMap with {len(self)} names>"
+
+
+class Converter:
+    def __init__(self):
+        self._log = Diagnostics()
+        # (csi_type, ops_type) -> TagMap
+        self._tags = {}
+        self._ops_count = defaultdict(int, {
                 "node":       0,
                 "transform":  0,
                 "element":    0,
@@ -50,7 +189,7 @@ class Converter:
                 "section":    0,
                 "material":   0,
                 "integration": 0
-        }
+        })
 
         self._library = {
             "frame_sections": {},
@@ -58,33 +197,82 @@ class Converter:
             "link_materials": defaultdict(dict),
         }
 
-    def identify(self, csi_type, ops_type, csi_name)->int:
-        if ops_type not in self._csi_names[csi_type]:
-            self._csi_names[csi_type][ops_type] = {}
-            return None
+    def tags(self, csi_type, ops_type)->TagMap:
+        """
+        Return the ``TagMap`` from names of ``csi_type`` objects to tags of
+        the ``ops_type`` objects defined for them.
+        """
+        key = (csi_type, ops_type)
+        if key not in self._tags:
+            self._tags[key] = TagMap()
+        return self._tags[key]
 
-        if csi_name in self._csi_names[csi_type][ops_type]:
-            return self._csi_names[csi_type][ops_type][csi_name]
+    def name(self, csi_type, ops_type, tag: int):
+        """
+        Return the name of the ``csi_type`` object that the ``ops_type``
+        object ``tag`` was defined for, or None.
+        """
+        tags = self._tags.get((csi_type, ops_type), None)
+        if tags is None:
+            return None
+        return tags.name(tag)
 
-        return None
+    def identify(self, csi_type, ops_type, csi_name)->int:
+        tags = self._tags.get((csi_type, ops_type), None)
+        if tags is None:
+            return None
+        return tags.get(csi_name)
 
     def define(self, csi_type, ops_type, csi_name=None, item=None)->int:
-        if ops_type not in self._csi_names[csi_type]:
-            self._csi_names[csi_type][ops_type] = {}
-
         if csi_name is None:
             self._ops_count[ops_type] += 1
             return self._ops_count[ops_type]
 
-        if csi_name not in self._csi_names[csi_type][ops_type]:
+        tags = self._tags.get((csi_type, ops_type), None)
+        if tags is None:
+            tags = self.tags(csi_type, ops_type)
+
+        tag = tags.get(csi_name)
+        if tag is None:
             self._ops_count[ops_type] += 1
             if item is None:
                 item = self._ops_count[ops_type]
-            self._csi_names[csi_type][ops_type][csi_name] = item
+            tag = tags.add(csi_name, item)
+
+        return tag
+
+    def identify_many(self, csi_type, ops_type, names, default: int=-1)->np.ndarray:
+        """
+        Return an array with the tag of each of ``names``, like ``identify``,
+        with ``default`` for names that were not defined.
+        """
+        tags = self._tags.get((csi_type, ops_type), None)
+        if tags is None:
+            return np.full(len(names), default, dtype=np.int64)
+        return tags.lookup(names, default)
+
+    def define_many(self, csi_type, ops_type, names)->np.ndarray:
+        """
+        Define each of ``names`` like ``define``, and return an array with
+        their tags. Names that are not defined yet are given a block of
+        consecutive tags, in order of their first occurrence.
+        """
+        tags = self.tags(csi_type, ops_type)
+        self._ops_count[ops_type] += tags.add_many(names, self._ops_count[ops_type] + 1)
+        return tags.lookup(names)
 
-        return self._csi_names[csi_type][ops_type][csi_name]
 
+    @property
+    def diagnostics(self)->Diagnostics:
+        return self._log
 
-    def log(self, message):
-        self._log.append(message)
+    def log(self, message, object=None, table=None):
+        """
+        Report that ``object`` could not be converted. ``message`` is either
+        the name of the diagnostic category or an ``UnimplementedInstance``.
+        """
+        if isinstance(message, str):
+            self._log.record(message, object, table)
+        else:
+            self._log.append(message)
 
@@ -10,17 +10,20 @@
 #
 import numpy as np
 from ..convert import Converter
+from ..ir import ModelIR, emit
 from .parse import load
+from .write import dump
+from .results import load_results
+from .batch import load_many
 from .utility import UnimplementedInstance, print_log
 from ._frame import add_frames
-from ._shell import add_shells
-from ._solid import add_solids
+from ._shell import create_shells
 from .point import create_points
 from .link import create_links
-from ._section import add_shell_sections
-from ._frame.section import add_frame_sections
-from ._frame.outlines import collect_geometry as collect_outlines
+from ._section import create_shell_sections
+from ._frame.section import create_frame_sections, collect_geometry as collect_outlines
 from .utility import find_row, find_rows
+from .tables import Tables, profile, active_profile
 
 CONFIG = {
     "Frame": {
@@ -51,7 +54,7 @@ def create_materials(csi, model, conv):
         if mat["SymType"] == "Isotropic":
             pass
         else:
-            conv.log(UnimplementedInstance("Material", mat))
+            conv.log("Material", mat, "MATERIAL PROPERTIES 01 - GENERAL")
             continue
         
         p02 = find_row(csi.get("MATERIAL PROPERTIES 02 - BASIC MECHANICAL PROPERTIES", []), Material=mat["Material"])
@@ -66,7 +69,7 @@ def create_materials(csi, model, conv):
 
     for link in csi.get("LINK PROPERTY DEFINITIONS 02 - LINEAR", []):
         if link["Fixed"]:
-            conv.log(UnimplementedInstance("Link.Fixed", link))
+            conv.log("Link.Fixed", link, "LINK PROPERTY DEFINITIONS 02 - LINEAR")
             continue
 
         name = link["Link"]
@@ -86,7 +89,7 @@ def create_materials(csi, model, conv):
 
     for damper in csi.get("LINK PROPERTY DEFINITIONS 04 - DAMPER", []):
         # TODO: implement dampers
-        conv.log(UnimplementedInstance("Link.Damper", damper))
+        conv.log("Link.Damper", damper, "LINK PROPERTY DEFINITIONS 04 - DAMPER")
         continue
         name = damper["Link"]
         stiff = damper["TransK"]
@@ -117,11 +120,11 @@ def create_materials(csi, model, conv):
 
 
     # 2) Frame
-    add_frame_sections(csi, model, conv)
+    create_frame_sections(csi, model, conv)
 
 
     # 3) Shell
-    add_shell_sections(csi, model, conv)
+    create_shell_sections(csi, model, conv)
     return library
 
 
@@ -138,18 +141,23 @@ def apply_loads(csi, model):
 
 
 
-def create_model(csi, types=None, model=None, verbose=False):
+def create_ir(csi, verbose=False):
     """
+    Convert ``csi`` to a ``ModelIR`` without creating an OpenSees model.
+
     Parameters
     ==========
     csi: a dictionary formed by calling ``csi.parse.load("file.b2k")``
 
     Returns
     =======
-    model: opensees.openseespy.Model object
+    ``(ir, conv)`` with the ``ModelIR`` and the ``Converter`` that holds
+    the tags and diagnostics of the conversion.
     """
 
-    import opensees.openseespy as ops
+    # Index tables on first lookup so that find_row is not a linear scan
+    if not isinstance(csi, Tables):
+        csi = Tables(csi)
 
     config = CONFIG
 
@@ -167,15 +175,8 @@ def create_model(csi, types=None, model=None, verbose=False):
     ndm = sum(1 for k,v in csi["ACTIVE DEGREES OF FREEDOM"][0].items()
               if k[0] == "U")
 
-    if isinstance(verbose, int) and verbose > 3:
-        import sys
-        echo_file = sys.stdout
-    else:
-        echo_file = None
-
-    if model is None:
-        model = ops.Model(ndm=ndm, ndf=ndf, echo_file=echo_file)
-
+    # Objects are collected in arrays and created in a model by emit
+    ir   = ModelIR(ndm=ndm, ndf=ndf)
     conv = Converter()
 
     used.add("ACTIVE DEGREES OF FREEDOM")
@@ -193,47 +194,75 @@ def create_model(csi, types=None, model=None, verbose=False):
     #
     # Create nodes
     #
-    create_points(csi, model, None, config, conv)
+    create_points(csi, ir, None, config, conv)
 
     # Create materials and sections
-    library = create_materials(csi, model, conv)
+    library = create_materials(csi, ir, conv)
 
 
     # Unimplemented objects
     for item in [
         "CONNECTIVITY - CABLE",
-        "CONNECTIVITY - TENDON"]:
+        "CONNECTIVITY - TENDON",
+        "CONNECTIVITY - SOLID"]:
         for elem in csi.get(item, []):
-            conv.log(UnimplementedInstance(item, elem))
+            conv.log(item, elem, item)
 
     #
     # Create Links
     #
-    create_links(csi, model, library, config, conv)
+    create_links(csi, ir, library, config, conv)
 
     #
     # Create frames
     #
-    add_frames(csi, model, library, config, conv)
+    add_frames(csi, ir, library, config, conv)
 
     #
     # Create shells
     #
-    add_shells(csi, model, conv)
+    create_shells(csi, ir, library, conv)
 
-    #
-    #
-    #
-    add_solids(csi, model, config, conv)
+    if verbose and conv.diagnostics:
+        print_log(conv.diagnostics)
 
-    if verbose and len(conv._log) > 0:
-        print_log(conv._log)
+    if verbose and active_profile() is not None:
+        active_profile().report()
 
     if verbose and False:
         for table in csi:
             if table not in used:
                 print(f"\t{table}", file=sys.stderr)
 
-    model.frame_tags = library.get("frame_tags", {})
+    return ir, conv
+
+
+def create_model(csi, types=None, model=None, verbose=False):
+    """
+    Parameters
+    ==========
+    csi: a dictionary formed by calling ``csi.parse.load("file.b2k")``
+
+    Returns
+    =======
+    model: opensees.openseespy.Model object
+    """
+
+    import opensees.openseespy as ops
+
+    ir, conv = create_ir(csi, verbose=verbose)
+
+    if isinstance(verbose, int) and verbose > 3:
+        import sys
+        echo_file = sys.stdout
+    else:
+        echo_file = None
+
+    if model is None:
+        model = ops.Model(ndm=ir.ndm, ndf=ir.ndf, echo_file=echo_file)
+    emit(ir, model)
+
+    model.frame_tags = conv._library.get("frame_tags", {})
+    model.diagnostics = conv.diagnostics
     return model
 
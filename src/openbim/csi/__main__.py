@@ -5,25 +5,32 @@
 #===----------------------------------------------------------------------===#
 #
 import math
-from openbim.csi import create_model, apply_loads, load, collect_outlines
+from openbim.csi import create_model, create_ir, apply_loads, load, collect_outlines, cache
+from openbim.ir import emit
+from openbim.export import dump_json, dump_tcl
 
 if __name__ == "__main__":
     import sys
 
-    with open(sys.argv[2], "r") as f:
-        csi = load(f)
+    # Repeated runs on the same file reuse the parsed tables
+    csi = load(sys.argv[2], cache=cache.enabled(default=True))
 
 
     if sys.argv[1][1] == "C":
         # Convert
         if "tcl" in sys.argv[1]:
-            import xara 
-            model = xara.Model(ndm=3, ndf=6, echo_file=sys.stdout)
-            model = create_model(csi, model=model, verbose=False)
+            ir, _ = create_ir(csi, verbose=False)
+            dump_tcl(ir, sys.stdout)
             sys.exit()
         else:
-            model = create_model(csi, verbose=False)
-            model.print("-json")
+            ir, _ = create_ir(csi, verbose=False)
+            try:
+                # Write the JSON directly, without creating the model
+                dump_json(ir, sys.stdout)
+            except NotImplementedError:
+                import opensees.openseespy as ops
+                model = emit(ir, ops.Model(ndm=ir.ndm, ndf=ir.ndf))
+                model.print("-json")
             sys.exit()
 
 
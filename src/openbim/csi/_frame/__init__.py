@@ -8,17 +8,10 @@ import sys
 import numpy as np
 import warnings
 
-from ..utility import UnimplementedInstance, find_row
+from .records import frame_records
 
-
-def _is_truss(frame, csi):
-    if "FRAME RELEASE ASSIGNMENTS 1 - GENERAL" in csi:
-        release = find_row(csi["FRAME RELEASE ASSIGNMENTS 1 - GENERAL"],
-                        Frame=frame["Frame"])
-    else:
-        return False
-
-    return release and all(release[i] for i in ("TI", "M2I", "M3I", "M2J", "M3J"))
+# Orientation vectors that agree to this many decimals share a transformation
+DECIMALS = 10
 
 
 def _orient(xi, xj, angle):
@@ -62,85 +55,84 @@ def _orient(xi, xj, angle):
 
 def add_frames(csi, model, library, config, conv):
     ndm = config.get("ndm", 3)
-    log = []
 
     # itag = 1
-    transform = 1
+    # rounded vecxz -> tag of the geometric transformation
+    transforms = {}
 
     tags = {}
 
-    for frame in csi.get("CONNECTIVITY - FRAME",[]):
-        if _is_truss(frame, csi):
-            conv.log(UnimplementedInstance("Truss", frame))
+    records = frame_records(csi)
+    truss   = records.truss
+    self_mass = records.self_mass
+
+    frames = csi.get("CONNECTIVITY - FRAME",[])
+    ends = np.column_stack((
+        conv.identify_many("Joint", "node", [frame["JointI"] for frame in frames]),
+        conv.identify_many("Joint", "node", [frame["JointJ"] for frame in frames])
+    )).tolist()
+
+    for i, frame in enumerate(frames):
+        if truss[i]:
+            conv.log("Truss", frame, "CONNECTIVITY - FRAME")
             continue
 
         if "IsCurved" in frame and frame["IsCurved"]:
-            conv.log(UnimplementedInstance("Frame.Curve", frame))
+            conv.log("Frame.Curve", frame, "CONNECTIVITY - FRAME")
 
-        nodes = (
-            conv.identify("Joint", "node", frame["JointI"]),
-            conv.identify("Joint", "node", frame["JointJ"])
-        )
-
-        if "FRAME ADDED MASS ASSIGNMENTS" in csi:
-            row = find_row(csi["FRAME ADDED MASS ASSIGNMENTS"],
-                            Frame=frame["Frame"])
-            additional_mass = row["MassPerLen"] if row else 0.0
-        else:
-            additional_mass = 0.0
+        nodes = tuple(ends[i])
 
         #
         # Geometric transformation
         #
-        if "FRAME LOCAL AXES ASSIGNMENTS 1 - TYPICAL" in csi:
-            row = find_row(csi["FRAME LOCAL AXES ASSIGNMENTS 1 - TYPICAL"],
-                            Frame=frame["Frame"])
-            angle = row["Angle"] if row else 0.0
-        else:
-            angle = 0
-
         xi = np.array(model.nodeCoord(nodes[0]))
         xj = np.array(model.nodeCoord(nodes[1]))
         if np.linalg.norm(xj - xi) < 1e-10:
-            log.append(UnimplementedInstance("Frame.ZeroLength", frame))
+            conv.log("Frame.ZeroLength", frame, "CONNECTIVITY - FRAME")
             print(f"ZERO LENGTH FRAME: {frame['Frame']}", file=sys.stderr)
             continue
 
         if ndm == 3:
-            vecxz = _orient(xi, xj, angle)
-            model.geomTransf("Linear", transform, *vecxz)
+            vecxz = _orient(xi, xj, records.angle[i])
+            # Adding 0.0 turns -0.0 into 0.0
+            key = tuple((np.round(vecxz, DECIMALS) + 0.0).tolist())
         else:
-            model.geomTransf("Linear", transform)
-
-        transform += 1
+            vecxz = ()
+            key = ()
+
+        # Frames with the same rounded vecxz use the unrounded vector of
+        # the first of them
+        transform = transforms.get(key, None)
+        if transform is None:
+            transform = transforms[key] = len(transforms) + 1
+            model.geomTransf("Linear", transform, *vecxz)
 
         #
         # Section
         #
-        assign = find_row(csi["FRAME SECTION ASSIGNMENTS"], Frame=frame["Frame"])
-        
-        sect_info = find_row(csi["FRAME SECTION PROPERTIES 01 - GENERAL"],
-                             SectionName=assign["AnalSect"])
+        assign = records.assign[i]
+        sect_info = records.properties[i]
         if not sect_info:
-            conv.log(UnimplementedInstance("FrameSection.Unknown", assign))
+            if assign:
+                conv.log("FrameSection.Unknown", assign, "FRAME SECTION ASSIGNMENTS")
+            else:
+                conv.log("FrameSection.Unknown", frame, "CONNECTIVITY - FRAME")
             continue
 
         # ---------------------------------------------------------------------
         # Handle prismatic vs nonprismatic to get mass/length
         # ---------------------------------------------------------------------
-        is_nonprismatic = (sect_info["Shape"] == "Nonprismatic")
+        is_nonprismatic = (records.shape[i] == "Nonprismatic")
 
         if not is_nonprismatic:
             #   
             # Prismatic section
             #
-            A = sect_info["Area"]  # cross‐sectional area
-            mat_info = find_row(csi["MATERIAL PROPERTIES 02 - BASIC MECHANICAL PROPERTIES"],
-                                Material=sect_info["Material"])
-            rho = mat_info["UnitMass"]  # material density (mass / volume)
-
             # self‐weight mass per length = area × density
-            self_weight_mpl = A * rho
+            self_weight_mpl = self_mass[i]
+            if np.isnan(self_weight_mpl):
+                conv.log("FrameSection.Material", sect_info, "FRAME SECTION PROPERTIES 01 - GENERAL")
+                continue
 
         else:
             #
@@ -158,14 +150,14 @@ def add_frames(csi, model, library, config, conv):
                 total_length = np.linalg.norm(xj - xi)
 
             if total_length < 1e-10:
-                conv.log(UnimplementedInstance("FrameSection.NonprismaticZeroLength", assign))
+                conv.log("FrameSection.NonprismaticZeroLength", assign, "FRAME SECTION ASSIGNMENTS")
                 continue
 
             # self‐weight mass per length = total mass / total length
             self_weight_mpl = total_mass / total_length
 
         # Combine any assigned mass per length with self‐weight mass per length
-        total_mass = self_weight_mpl + additional_mass
+        total_mass = self_weight_mpl + records.added_mass[i]
 
         # section = library["frame_sections"][assign["AnalSect"]] # conv.identify("AnalSect", "section", assign["AnalSect"]) #
 
@@ -183,7 +175,7 @@ def add_frames(csi, model, library, config, conv):
                           conv.define("Frame", "element", frame["Frame"]),
                           nodes,
                           section=section,
-                          transform=transform-1,
+                          transform=transform,
                           mass=total_mass
             )
             tags[frame["Frame"]] = e
@@ -194,19 +186,16 @@ def add_frames(csi, model, library, config, conv):
             e = model.element("ForceFrame",
                               conv.define("Frame", "element", frame["Frame"]),
                               nodes,
-                              transform-1,
+                              transform,
                               integr,
                               mass=total_mass
             )
             tags[frame["Frame"]] = e
 
         else:
-            conv.log(UnimplementedInstance("FrameSection.NPSectType", assign["NPSectType"]))
+            conv.log("FrameSection.NPSectType", assign, "FRAME SECTION ASSIGNMENTS")
             continue
 
     library["frame_tags"] = tags
 
 
-    return log
-
-
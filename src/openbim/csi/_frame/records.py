@@ -0,0 +1,134 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Join of the frame connectivity with its section, material, mass, local
+axis and release assignments.
+
+Converting a frame needs rows from six tables. ``FrameRecords`` resolves
+them once for all frames and stores the result as one array per field,
+indexed like ``CONNECTIVITY - FRAME``:
+
+    >>> records = frame_records(csi)
+    >>> i = records.index("12")
+    >>> records.section[i], records.area[i]*records.density[i]
+    ('FSEC1', 0.0224)
+"""
+import numpy as np
+
+from ..tables import Tables, get_table
+
+# Release flags that make a frame a truss
+RELEASES = ("TI", "M2I", "M3I", "M2J", "M3J")
+
+
+class FrameRecords:
+    """
+    One record per row of ``CONNECTIVITY - FRAME``.
+
+    Fields that are missing from the model are NaN for numbers and None for
+    names and rows. ``assign`` and ``properties`` hold the section
+    assignment and section property rows, for the fields that are not
+    stored in arrays.
+    """
+    def __init__(self, csi):
+        frames = csi.get("CONNECTIVITY - FRAME", [])
+        n = len(frames)
+
+        assigns    = get_table(csi, "FRAME SECTION ASSIGNMENTS")
+        sections   = get_table(csi, "FRAME SECTION PROPERTIES 01 - GENERAL")
+        materials  = get_table(csi, "MATERIAL PROPERTIES 02 - BASIC MECHANICAL PROPERTIES")
+        masses     = get_table(csi, "FRAME ADDED MASS ASSIGNMENTS")
+        axes       = get_table(csi, "FRAME LOCAL AXES ASSIGNMENTS 1 - TYPICAL")
+        releases   = get_table(csi, "FRAME RELEASE ASSIGNMENTS 1 - GENERAL")
+
+        self.frame      = np.empty(n, dtype=object)
+        self.section    = np.empty(n, dtype=object)
+        self.shape      = np.empty(n, dtype=object)
+        self.material   = np.empty(n, dtype=object)
+        self.assign     = np.empty(n, dtype=object)
+        self.properties = np.empty(n, dtype=object)
+        self.area       = np.full(n, np.nan)
+        self.density    = np.full(n, np.nan)
+        self.E          = np.full(n, np.nan)
+        self.G          = np.full(n, np.nan)
+        self.added_mass = np.zeros(n)
+        self.angle      = np.zeros(n)
+        self.releases   = np.zeros((n, len(RELEASES)), dtype=bool)
+        self._index     = {}
+
+        for i, frame in enumerate(frames):
+            name = frame["Frame"]
+            self.frame[i] = name
+            self._index.setdefault(name, i)
+
+            if (row := masses.find(Frame=name)) is not None:
+                self.added_mass[i] = row["MassPerLen"]
+
+            if (row := axes.find(Frame=name)) is not None:
+                self.angle[i] = row["Angle"]
+
+            if (row := releases.find(Frame=name)) is not None:
+                self.releases[i] = [bool(row.get(key, False)) for key in RELEASES]
+
+            assign = assigns.find(Frame=name)
+            if assign is None:
+                continue
+            self.assign[i]  = assign
+            self.section[i] = assign["AnalSect"]
+
+            section = sections.find(SectionName=assign["AnalSect"])
+            if section is None:
+                continue
+            self.properties[i] = section
+            self.shape[i]      = section.get("Shape", None)
+            self.material[i]   = section.get("Material", None)
+            self.area[i]       = section.get("Area", np.nan)
+
+            material = materials.find(Material=self.material[i])
+            if material is not None:
+                self.density[i] = material.get("UnitMass", np.nan)
+                self.E[i]       = material.get("E1", np.nan)
+                self.G[i]       = material.get("G12", np.nan)
+
+    @property
+    def truss(self)->np.ndarray:
+        """
+        True for frames whose axial and bending releases make them trusses.
+        """
+        return self.releases.all(axis=1)
+
+    @property
+    def self_mass(self)->np.ndarray:
+        """
+        Mass per length of prismatic frames from their section area and
+        material density; NaN for nonprismatic frames.
+        """
+        mass = self.area*self.density
+        mass[self.shape == "Nonprismatic"] = np.nan
+        return mass
+
+    def index(self, frame)->int:
+        """
+        Return the position of the record of frame ``frame``.
+        """
+        return self._index[frame]
+
+    def __len__(self):
+        return len(self.frame)
+
+
+def frame_records(csi)->FrameRecords:
+    """
+    Return the ``FrameRecords`` of ``csi``. When ``csi`` is a ``Tables``
+    object, the records are computed once and shared by later calls.
+    """
+    if not isinstance(csi, Tables):
+        return FrameRecords(csi)
+
+    if "FrameRecords" not in csi.cache:
+        csi.cache["FrameRecords"] = FrameRecords(csi)
+    return csi.cache["FrameRecords"]
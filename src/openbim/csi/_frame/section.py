@@ -1,7 +1,8 @@
-from ..utility import find_row, find_rows, UnimplementedInstance
+from ..utility import find_row, find_rows
+from ..tables import Tables, get_table
+from .records import frame_records
 import numpy as np
 import warnings
-from veux.frame import SectionGeometry
 
 _CIRCLE_DIVS = 40
 
@@ -44,25 +45,33 @@ def create_frame_sections(csi, model, conv):
                 continue
 
             assert False, sect
-            conv.log(UnimplementedInstance(f"FrameSection.Shape={sect['Shape']}"))
+            conv.log(f"FrameSection.Shape={sect['Shape']}", sect,
+                     "FRAME SECTION PROPERTIES 01 - GENERAL")
     return
 
 def collect_geometry(csi, elem_maps=None, conv=None):
     """
     collect section geometry
     """
+    from veux.frame import SectionGeometry
+    if not isinstance(csi, Tables):
+        csi = Tables(csi)
 
     frame_types = {
         row["SectionName"]: FrameQuadrature.from_table(csi, row)
         for row in csi.get("FRAME SECTION PROPERTIES 01 - GENERAL", [])
     }
 
+    records = frame_records(csi)
+
     frame_assigns = {}
-    for row in csi.get("FRAME SECTION ASSIGNMENTS",[]):
+    for frame, row in zip(records.frame, records.assign):
+        if row is None:
+            continue
 
         if row["MatProp"] != "Default":
             if conv is not None:
-                conv.log(UnimplementedInstance("FrameSection.MatProp", row["MatProp"]))
+                conv.log("FrameSection.MatProp", row, "FRAME SECTION ASSIGNMENTS")
             else:
                 warnings.warn(f"Material property {row['MatProp']} not implemented.")
 
@@ -70,7 +79,7 @@ def collect_geometry(csi, elem_maps=None, conv=None):
             if frame_types[row["AnalSect"]].geometry() is None:
                 warnings.warn(f"No geometry for {row['AnalSect']}")
                 continue
-            frame_assigns[row["Frame"]] = frame_types[row["AnalSect"]].geometry()
+            frame_assigns[frame] = frame_types[row["AnalSect"]].geometry()
             
 
 
@@ -99,6 +108,7 @@ def collect_geometry(csi, elem_maps=None, conv=None):
     
 
 def section_geometry(csi, prop_01):
+    from veux.frame import SectionGeometry
     if isinstance(prop_01, str):
         name = prop_01
         prop_01 = find_row(csi.get("FRAME SECTION PROPERTIES 01 - GENERAL",[]), SectionName=name)
@@ -143,43 +153,28 @@ def section_geometry(csi, prop_01):
             if prop_sd["nPolygon"] != prop_sd["nTotalShp"]:
                 # unimplemented
                 return
-            polygon_data = csi.get("SECTION DESIGNER PROPERTIES 16 - SHAPE POLYGON", [])
+            polygon_data = get_table(csi, "SECTION DESIGNER PROPERTIES 16 - SHAPE POLYGON")
+            vertices = polygon_data.arrays(("SectionName", "ShapeName"), ("X", "Y"))
 
-            exterior =  np.array([
-                [row["X"], row["Y"]]
-                for row in find_rows(polygon_data, SectionName = name) if row.get("ShapeName","")=="Polygon1"
-            ])
-            if len(exterior) == 0:
+            exterior = vertices.get((name, "Polygon1"), None)
+            if exterior is None:
                 return
-            
-            for hole in find_rows(polygon_data, SectionName = name, ShapeMat="Opening"):
-                interior.append(np.array([
-                    [row["X"], row["Y"]]
-                    for row in find_rows(polygon_data, ShapeName=hole["ShapeName"])
-                ]))
+
+            for hole in polygon_data.find_all(SectionName=name, ShapeMat="Opening"):
+                interior.append(vertices[(name, hole["ShapeName"])])
         else:
             warnings.warn(f"Unimplemented section designer section.")
 
     elif prop_01["Shape"] == "Bridge Section":
-        polygon_data = csi.get("FRAME SECTION PROPERTIES 06 - POLYGON DATA", [])
-        exterior_row = find_row(polygon_data, SectionName = name, Opening=False)
-        exterior =  np.array([
-            [row["X"], row["Y"]]
-            for row in find_rows(polygon_data, SectionName = name) if row["Polygon"] == exterior_row["Polygon"]
-        ])
-        ref = (exterior_row["RefPtX"], exterior_row["RefPtY"])
-
-        for i in range(len(exterior)):
-            exterior[i] -= ref
+        polygon_data = get_table(csi, "FRAME SECTION PROPERTIES 06 - POLYGON DATA")
+        vertices = polygon_data.arrays(("SectionName", "Polygon"), ("X", "Y"))
 
+        exterior_row = polygon_data.find(SectionName = name, Opening=False)
+        ref = np.array([exterior_row["RefPtX"], exterior_row["RefPtY"]])
+        exterior = vertices[(name, exterior_row["Polygon"])] - ref
 
-        for hole in find_rows(polygon_data, SectionName = name, Opening=True):
-            interior.append(np.array([
-                [row["X"], row["Y"]]
-                for row in find_rows(polygon_data, Polygon=hole["Polygon"])
-            ]))
-            for i in range(len(interior[-1])):
-                interior[-1][i] -= ref
+        for hole in polygon_data.find_all(SectionName = name, Opening=True):
+            interior.append(vertices[(name, hole["Polygon"])] - ref)
 
 
     if exterior is not None:
@@ -328,6 +323,7 @@ class FrameQuadrature:
 
     @classmethod
     def from_table(cls, csi, prop_01):
+        from veux.frame import SectionGeometry
         # 1)
         if prop_01["Shape"] != "Nonprismatic":
             geometry = section_geometry(csi, prop_01)
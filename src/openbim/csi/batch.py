@@ -0,0 +1,125 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Load batches of CSI models in parallel.
+
+Example
+=======
+
+    >>> from openbim import csi
+    >>> for result in csi.load_many(Path("models/Analysis").glob("*.s2k"), workers=8):
+    ...     if result.error is not None:
+    ...         print(result.path, result.error)
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+from .parse import load
+
+LoadResult = namedtuple("LoadResult", ["path", "value", "error"])
+LoadResult.__doc__ = """\
+Outcome of loading one file. Exactly one of ``value`` (the parsed tables,
+or the return value of ``convert``) and ``error`` (the exception raised
+while loading that file) is not None.
+"""
+
+
+def _load_one(path, convert, options):
+    try:
+        value = load(path, **options)
+        if convert is not None:
+            value = convert(value)
+        return LoadResult(path, value, None)
+
+    except Exception as e:
+        return LoadResult(path, None, e)
+
+
+def load_many(paths, workers: int=None, convert=None, ordered: bool=True, **options):
+    """
+    Load many CSI text files using a pool of ``workers`` processes.
+
+    Parameters
+    ==========
+    paths:    iterable of paths to ``.s2k``/``.b2k`` files.
+    workers:  number of worker processes; defaults to the number of CPUs.
+              With ``workers=1`` files are loaded in this process.
+    convert:  optional function applied to the tables of each file inside
+              the worker, e.g. to build a model. It and its return value
+              must be picklable.
+    ordered:  if True, results are yielded in the order of ``paths``;
+              otherwise they are yielded as soon as each file is done.
+    options:  passed on to ``load`` (e.g. ``skip``, ``columnar``).
+
+    At most ``2*workers`` files are submitted to the pool at a time. With
+    ``ordered=True``, results that finish early are held in memory until
+    the files before them are done, so at most that many are held.
+
+    Returns
+    =======
+    An iterator of ``LoadResult(path, value, error)``. An error in one
+    file does not interrupt the remaining files. Files that have not
+    started when the iterator is closed are not loaded.
+    """
+    # Options are checked here rather than in the generator so that errors
+    # are raised when load_many is called, not on the first next()
+    if options.get("lazy", False):
+        raise ValueError("lazy tables cannot be returned from worker processes")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    return _load_many(list(paths), workers, convert, ordered, options)
+
+
+def _load_many(paths, workers, convert, ordered, options):
+    if workers <= 1 or len(paths) <= 1:
+        for path in paths:
+            yield _load_one(path, convert, options)
+        return
+
+    workers = min(workers, len(paths))
+    pending = iter(paths)
+    # future -> path, in order of submission
+    running = {}
+
+    def submit()->bool:
+        path = next(pending, None)
+        if path is None:
+            return False
+        running[pool.submit(_load_one, path, convert, options)] = path
+        return True
+
+    def result(future):
+        path = running.pop(future)
+        try:
+            return future.result()
+        except Exception as e:
+            # The worker died or its result could not be sent back
+            return LoadResult(path, None, e)
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while len(running) < 2*workers and submit():
+            pass
+
+        while running:
+            if ordered:
+                done = [next(iter(running))]
+            else:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                yield result(future)
+                submit()
+    finally:
+        # Do not wait for queued files when the caller stops early;
+        # shutdown(cancel_futures=True) requires Python 3.9
+        for future in running:
+            future.cancel()
+        pool.shutdown()
@@ -0,0 +1,171 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+On-disk cache of parsed CSI tables.
+
+Entries are keyed on a hash of the file contents, the parser version and
+the options passed to ``load``, and are stored as pickles. When the cache
+grows beyond its size limit, the least recently used entries are removed.
+
+The cache is disabled unless it is turned on with the following
+environment variables, or by calling ``configure``:
+
+- ``OPENBIM_CACHE``: set to ``1`` to enable the cache, or ``0`` to
+  disable it,
+- ``OPENBIM_CACHE_DIR``: cache directory (default ``~/.cache/openbim/csi``),
+- ``OPENBIM_CACHE_SIZE``: size limit in megabytes (default 512).
+
+The command line entry points (``python -m openbim`` and
+``python -m openbim.csi``) use the cache unless ``OPENBIM_CACHE=0``,
+since they load the same files repeatedly.
+
+Use ``clear()`` to remove all entries.
+"""
+import os
+import pickle
+import hashlib
+import warnings
+from pathlib import Path
+
+_SUFFIX = ".pickle"
+
+def _flag(value):
+    if value is None:
+        return None
+    return value in {"1", "true", "True", "yes"}
+
+
+_CONFIG = {
+    # None when the cache was neither enabled nor disabled explicitly
+    "enabled":   _flag(os.environ.get("OPENBIM_CACHE", None)),
+    "directory": os.environ.get("OPENBIM_CACHE_DIR", None),
+    "max_size":  int(float(os.environ.get("OPENBIM_CACHE_SIZE", 512))*2**20),
+}
+
+
+def configure(enabled: bool=None, directory=None, max_size: int=None):
+    """
+    Change the cache settings for this process. ``max_size`` is in bytes.
+    """
+    if enabled is not None:
+        _CONFIG["enabled"] = enabled
+    if directory is not None:
+        _CONFIG["directory"] = directory
+    if max_size is not None:
+        _CONFIG["max_size"] = max_size
+
+
+def enabled(default: bool=False)->bool:
+    """
+    Return whether the cache is enabled, or ``default`` if it was not set
+    by ``OPENBIM_CACHE`` or ``configure``.
+    """
+    if _CONFIG["enabled"] is None:
+        return default
+    return _CONFIG["enabled"]
+
+
+def directory()->Path:
+    if _CONFIG["directory"] is not None:
+        return Path(_CONFIG["directory"])
+
+    root = os.environ.get("XDG_CACHE_HOME", None)
+    if root is None:
+        root = Path.home()/".cache"
+    return Path(root)/"openbim"/"csi"
+
+
+def key(data, version, **options)->str:
+    """
+    Compute the cache key for the file contents ``data`` (a bytes-like
+    object) parsed by parser ``version`` with the given ``load`` options.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(data)
+    h.update(repr((version, sorted(options.items()))).encode())
+    return h.hexdigest()
+
+
+def get(key: str):
+    """
+    Return the tables stored under ``key``, or None.
+    """
+    path = directory()/(key + _SUFFIX)
+    try:
+        with open(path, "rb") as f:
+            tables = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        warnings.warn(f"Ignoring unreadable cache entry {path}: {e}")
+        return None
+
+    # Mark as recently used
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+    return tables
+
+
+def put(key: str, tables):
+    """
+    Store ``tables`` under ``key`` and evict old entries if the cache is
+    over its size limit.
+    """
+    root = directory()
+    path = root/(key + _SUFFIX)
+    temp = root/(f"{key}.{os.getpid()}.tmp")
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        with open(temp, "wb") as f:
+            pickle.dump(tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, path)
+    except Exception as e:
+        warnings.warn(f"Failed to write cache entry {path}: {e}")
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        return
+
+    _evict(root, _CONFIG["max_size"])
+
+
+def _evict(root, max_size):
+    entries = []
+    for path in root.glob("*" + _SUFFIX):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_size:
+            break
+        try:
+            path.unlink()
+            total -= size
+        except OSError:
+            pass
+
+
+def clear():
+    """
+    Remove every entry from the cache.
+    """
+    root = directory()
+    if not root.exists():
+        return
+    for path in root.glob("*" + _SUFFIX):
+        try:
+            path.unlink()
+        except OSError:
+            pass
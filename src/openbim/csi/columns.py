@@ -0,0 +1,205 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Columnar storage for parsed CSI tables.
+
+A ``ColumnTable`` stores one NumPy array per column instead of one
+dictionary per row:
+
+- columns holding only booleans, integers or numbers are stored as
+  ``bool``, ``int64`` or ``float64`` arrays (columns that mix integers
+  and floats are stored as ``float64``),
+- columns of repeated strings are stored as categorical codes into a
+  table of unique values,
+- all other columns are stored as object arrays.
+
+Rows that do not define a column are recorded in a boolean mask for that
+column. Iterating over a ``ColumnTable`` yields row dictionaries with the
+same keys and values as the row-oriented tables produced by ``load``, so
+existing converters can consume either representation.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+_MISSING = object()
+
+
+class _Categorical:
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    @classmethod
+    def from_values(cls, values, present):
+        lookup = {}
+        codes  = np.fromiter((lookup.setdefault(v, len(lookup)) if p else -1
+                              for v, p in zip(values, present)),
+                             dtype=np.int32, count=len(values))
+        categories = np.empty(len(lookup), dtype=object)
+        categories[:] = list(lookup)
+        return cls(codes, categories)
+
+    def tolist(self):
+        categories = self.categories.tolist()
+        return [categories[c] if c >= 0 else None for c in self.codes.tolist()]
+
+    def array(self):
+        values = self.categories[self.codes]
+        values[self.codes < 0] = None
+        return values
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.categories.nbytes
+
+
+def _column(values: list, present: list):
+    """
+    Pick the most compact representation for a column.
+    """
+    types = {type(v) for v, p in zip(values, present) if p}
+
+    if types == {bool}:
+        return np.array([v if p else False for v, p in zip(values, present)], dtype=bool)
+
+    if types == {int}:
+        try:
+            return np.array([v if p else 0 for v, p in zip(values, present)], dtype=np.int64)
+        except OverflowError:
+            pass
+
+    elif types and types <= {int, float}:
+        return np.array([v if p else np.nan for v, p in zip(values, present)], dtype=float)
+
+    elif types == {str}:
+        categorical = _Categorical.from_values(values, present)
+        # Only worth it when values repeat
+        if 2*len(categorical.categories) <= len(values):
+            return categorical
+
+    column = np.empty(len(values), dtype=object)
+    for i, (v, p) in enumerate(zip(values, present)):
+        if p:
+            column[i] = v
+    return column
+
+
+class ColumnTable(Sequence):
+    """
+    A CSI table stored column by column.
+
+    ``table[i]`` and ``iter(table)`` produce row dictionaries, while
+    ``table.column(name)`` and ``table.mask(name)`` give vectorized
+    access to a single column.
+    """
+    def __init__(self, columns: dict, masks: dict, length: int):
+        self._columns = columns
+        self._masks   = masks
+        self._length  = length
+
+    @classmethod
+    def from_rows(cls, rows: list):
+        names = {}
+        for row in rows:
+            for name in row:
+                names[name] = None
+
+        columns = {}
+        masks   = {}
+        for name in names:
+            values  = [row.get(name, _MISSING) for row in rows]
+            present = [v is not _MISSING for v in values]
+            columns[name] = _column(values, present)
+            if not all(present):
+                masks[name] = np.array(present, dtype=bool)
+
+        return cls(columns, masks, len(rows))
+
+    def keys(self):
+        return self._columns.keys()
+
+    def column(self, name)->np.ndarray:
+        """
+        Return the values of column ``name`` as an array. Entries of rows
+        that do not define the column are NaN for float columns, and
+        ``None`` for string and object columns.
+        """
+        column = self._columns[name]
+        if isinstance(column, _Categorical):
+            return column.array()
+        return column
+
+    def mask(self, name)->np.ndarray:
+        """
+        Return a boolean array that is True for rows that define ``name``.
+        """
+        if name in self._masks:
+            return self._masks[name]
+        elif name in self._columns:
+            return np.ones(self._length, dtype=bool)
+        raise KeyError(name)
+
+    def codes(self, name):
+        """
+        Return ``(codes, categories)`` for a categorical column, or None if
+        column ``name`` is not stored as categorical.
+        """
+        column = self._columns[name]
+        if isinstance(column, _Categorical):
+            return column.codes, column.categories
+
+    @property
+    def nbytes(self)->int:
+        return sum(c.nbytes for c in self._columns.values()) \
+             + sum(m.nbytes for m in self._masks.values())
+
+    def _row(self, i)->dict:
+        row = {}
+        for name, column in self._columns.items():
+            if name in self._masks and not self._masks[name][i]:
+                continue
+            if isinstance(column, _Categorical):
+                row[name] = column.categories[column.codes[i]]
+            else:
+                row[name] = column[i].item() if column.dtype != object else column[i]
+        return row
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self.column(key)
+
+        if isinstance(key, slice):
+            return [self._row(i) for i in range(*key.indices(self._length))]
+
+        if key < 0:
+            key += self._length
+        if not 0 <= key < self._length:
+            raise IndexError("table index out of range")
+        return self._row(key)
+
+    def __iter__(self):
+        columns = [
+            (name, column.tolist(), self._masks[name].tolist() if name in self._masks else None)
+            for name, column in self._columns.items()
+        ]
+        for i in range(self._length):
+            yield {
+                name: values[i] for name, values, mask in columns
+                if mask is None or mask[i]
+            }
+
+    def __len__(self):
+        return self._length
+
+    def __eq__(self, other):
+        if isinstance(other, (ColumnTable, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<ColumnTable with {self._length} rows and {len(self._columns)} columns>"
@@ -0,0 +1,189 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Incremental re-parsing of edited CSI files.
+
+A file is summarized by the digest of the raw text of each of its tables.
+When a new version of the file is loaded with ``reload``, only tables whose
+digest changed are parsed again, and the differences are reported table by
+table and row by row:
+
+    >>> tables, digests, _ = reload({}, {}, "Tower.s2k")
+    ... # edit and re-export the model
+    >>> tables, digests, diff = reload(tables, digests, "Tower.s2k")
+    >>> diff.changed["FRAME SECTION ASSIGNMENTS"].changed
+    [({'Frame': 1, 'AnalSect': 'FSEC1', ...}, {'Frame': 1, 'AnalSect': 'FSEC2', ...})]
+"""
+import locale
+import hashlib
+
+from .parse import LazyTables, _index_tables, _read
+
+
+class RowDiff:
+    """
+    Row-level differences of one table.
+
+    ``removed`` and ``added`` hold the rows that are only in the old or
+    the new table. Rows that only changed some of their values are reported
+    as ``(old, new)`` pairs in ``changed`` when they can be matched by the
+    value of the table's first column.
+    """
+    def __init__(self, added, removed, changed):
+        self.added   = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"<RowDiff +{len(self.added)} -{len(self.removed)} ~{len(self.changed)}>"
+
+
+class ModelDiff:
+    """
+    Table-level differences between two versions of a file.
+
+    ``added`` and ``removed`` are the names of tables that are only in the
+    new or the old version, and ``changed`` maps the name of every table
+    present in both versions whose rows differ to its ``RowDiff``.
+    """
+    def __init__(self, added, removed, changed):
+        self.added   = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def __repr__(self):
+        return f"<ModelDiff +{len(self.added)} -{len(self.removed)} ~{len(self.changed)} tables>"
+
+
+def _row_key(row):
+    try:
+        return tuple(sorted(row.items()))
+    except TypeError:
+        # Unhashable values (e.g., lists)
+        return repr(sorted(row.items()))
+
+
+def diff_rows(old, new)->RowDiff:
+    """
+    Compare two versions of a table, each a sequence of row dictionaries.
+    """
+    counts = {}
+    for row in new:
+        key = _row_key(row)
+        counts[key] = counts.get(key, 0) + 1
+
+    removed = []
+    for row in old:
+        key = _row_key(row)
+        if counts.get(key, 0) > 0:
+            counts[key] -= 1
+        else:
+            removed.append(row)
+
+    added = []
+    for row in new:
+        key = _row_key(row)
+        if counts.get(key, 0) > 0:
+            counts[key] -= 1
+            added.append(row)
+
+    # Pair rows that kept the value of their first column
+    changed = []
+    if removed and added:
+        def first(row):
+            for value in row.values():
+                return value
+
+        def group(rows):
+            groups = {}
+            for row in rows:
+                try:
+                    groups.setdefault(first(row), []).append(row)
+                except TypeError:
+                    pass
+            return groups
+
+        old_groups = group(removed)
+        new_groups = group(added)
+        for key, rows in old_groups.items():
+            if len(rows) == 1 and len(new_groups.get(key, ())) == 1:
+                changed.append((rows[0], new_groups[key][0]))
+
+        paired  = {id(row) for pair in changed for row in pair}
+        removed = [row for row in removed if id(row) not in paired]
+        added   = [row for row in added   if id(row) not in paired]
+
+    return RowDiff(added, removed, changed)
+
+
+def _digests(data, index)->dict:
+    digests = {}
+    for name, spans in index.items():
+        h = hashlib.blake2b(digest_size=16)
+        for start, stop in spans:
+            chunk = data[start:stop]
+            h.update(chunk.encode() if isinstance(chunk, str) else chunk)
+        digests[name] = h.hexdigest()
+    return digests
+
+
+def digests(file)->dict:
+    """
+    Return a dictionary mapping the name of each table in ``file`` (a path
+    or file-like object) to a digest of its text.
+    """
+    data = _read(file)
+    return _digests(data, _index_tables(data, locale.getpreferredencoding(False)))
+
+
+def reload(tables: dict, previous: dict, file):
+    """
+    Load a new version of a file that was previously parsed into
+    ``tables``, where ``previous`` are the table digests of that version
+    (as returned by ``digests`` or a previous call to ``reload``).
+
+    Tables whose digest is unchanged are reused from ``tables`` without
+    being parsed again.
+
+    Returns
+    =======
+    ``(tables, digests, diff)`` with the tables and digests of the new
+    version and a ``ModelDiff`` from the old version to the new one.
+    """
+    data     = _read(file)
+    encoding = locale.getpreferredencoding(False)
+    index    = _index_tables(data, encoding)
+    current  = _digests(data, index)
+    lazy     = LazyTables(data, index, encoding)
+
+    updated = {}
+    changed = {}
+    for name, digest in current.items():
+        if name in tables and previous.get(name, None) == digest:
+            updated[name] = tables[name]
+            continue
+
+        updated[name] = lazy[name]
+        if name in tables:
+            rows = diff_rows(tables[name], updated[name])
+            if rows:
+                changed[name] = rows
+
+    lazy.close()
+
+    diff = ModelDiff(
+        added   = [name for name in current if name not in tables],
+        removed = [name for name in tables  if name not in current],
+        changed = changed
+    )
+    return updated, current, diff
@@ -6,7 +6,7 @@
 #
 import numpy as np
 import warnings
-from .utility import UnimplementedInstance, find_row, find_rows
+from .utility import find_row, find_rows
 from .handler import Handler
 
 
@@ -81,7 +81,8 @@ def create_links(csi, model, library, config, conv):
                              Link=assign["LinkProp"])
 
             if props["LinkType"] != "Linear":
-                conv.log(UnimplementedInstance(f"Joint.SingleJoint.LinkType={props['LinkType']}", assign))
+                conv.log(f"Joint.SingleJoint.LinkType={props['LinkType']}", assign,
+                         "LINK PROPERTY ASSIGNMENTS")
 
             # TODO: Implement soil springs
             props = find_rows(csi["LINK PROPERTY DEFINITIONS 02 - LINEAR"],
@@ -98,7 +99,7 @@ def create_links(csi, model, library, config, conv):
             continue
 
         elif assign["LinkJoints"] != "TwoJoint":
-            conv.log(UnimplementedInstance(f"Joint.{assign['LinkJoints']}", assign))
+            conv.log(f"Joint.{assign['LinkJoints']}", assign, "LINK PROPERTY ASSIGNMENTS")
             continue
 
         #
@@ -109,7 +110,7 @@ def create_links(csi, model, library, config, conv):
         dofs = tuple(["U1", "U2", "U3", "R1", "R2", "R3"].index(i)+1 for i in dofs)
 
         if len(dofs) == 0:
-            conv.log(UnimplementedInstance(f"Joint.DOFS", assign))
+            conv.log(f"Joint.DOFS", assign, "LINK PROPERTY ASSIGNMENTS")
             continue
 
         # Check whether there are any zero-length link elements
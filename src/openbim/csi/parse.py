@@ -4,9 +4,24 @@
 #
 #===----------------------------------------------------------------------===#
 #
+import io
+import os
+import re
+import sys
 import json
 import shlex
+import mmap
+import locale
 import warnings
+from collections.abc import MutableMapping
+
+from .. import compressed
+from . import cache as _cache
+from .columns import ColumnTable
+
+# Increment when the tables produced by load() change for the same input,
+# so that stale cache entries are not reused.
+PARSER_VERSION = 1
 
 CONSTANTS = {
         "Yes": True,
@@ -22,10 +37,437 @@ def _parse_value(v):
     except:
         return v
 
-def load(file, append: dict=None):
+#
+# Typed decoders
+#
+# Each of these returns the same value as _parse_value, but avoids calling
+# json.loads (and catching its exception) for the values that the column
+# is expected to hold. The expected type of each column is taken from
+# schemas.json.
+#
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?P<real>(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?)")
+
+# Characters that can start a JSON value (including leading whitespace)
+_JSON_START = set('-0123456789"[{tfnNI \t\r\n')
+
+def _parse_number(v):
+    m = _NUMBER.fullmatch(v)
+    if m is None:
+        return _parse_value(v)
+    elif m.group("real"):
+        return float(v)
+    else:
+        return int(v)
+
+def _parse_bool(v):
+    if v in CONSTANTS:
+        return CONSTANTS[v]
+    return _parse_value(v)
+
+def _parse_string(v):
+    if v in CONSTANTS:
+        return CONSTANTS[v]
+    elif v[:1] in _JSON_START:
+        return _parse_value(v)
+    return v
+
+_DECODERS = {
+    "integer": _parse_number,
+    "number":  _parse_number,
+    "boolean": _parse_bool,
+    "string":  _parse_string,
+}
+
+_SCHEMAS = None
+
+def _decoders(table_name)->dict:
+    """
+    Return a dictionary mapping each known column of ``table_name`` to
+    the function used to decode its values. Columns that are missing
+    from the dictionary are decoded with _parse_value.
+    """
+    global _SCHEMAS
+    if _SCHEMAS is None:
+        _SCHEMAS = {}
+        try:
+            with open(os.path.join(os.path.dirname(__file__), "schemas.json"), "r") as f:
+                schemas = json.load(f)
+        except (OSError, ValueError) as e:
+            warnings.warn(f"Failed to read table schemas: {e}")
+            schemas = {}
+
+        for name, schema in schemas.items():
+            columns = {}
+            for key, prop in schema.get("properties", {}).items():
+                types = prop.get("type", None)
+                if isinstance(types, list):
+                    # Columns of mixed type (e.g. names that may be
+                    # integers) start like strings.
+                    types = "string" if "string" in types else None
+                if types in _DECODERS:
+                    columns[key] = _DECODERS[types]
+            _SCHEMAS[name] = columns
+
+    return _SCHEMAS.get(table_name, {})
+
+# Data lines are tokenized with the same rules as a POSIX shlex configured
+# with whitespace_split=True, quotes='"', and "'" as a word character:
+# words are separated by blanks, double-quoted spans and backslash escapes
+# may appear anywhere inside a word, and an unquoted "#" discards the rest
+# of the line. Lines without any of these characters are split directly
+# with str.split, which agrees with shlex as long as the only blanks in the
+# line are spaces (i.e., the line is printable).
+_TOKEN   = re.compile(r"""
+      (?P<word>(?:[^ \t\r\n"\\\#]+|"(?:[^"\\]|\\.)*"|\\.)+)
+    | (?P<blank>[ \t\r\n]+)
+    | (?P<comment>\#)
+    | (?P<quote>")
+    | (?P<escape>\\)
+""", re.VERBOSE|re.DOTALL)
+_PART    = re.compile(r"""
+      "(?P<quoted>(?:[^"\\]|\\.)*)"
+    | \\(?P<escaped>.)
+    | (?P<plain>[^"\\]+)
+""", re.VERBOSE|re.DOTALL)
+_QUOTED_ESCAPE = re.compile(r'\\(["\\])')
+
+
+def _unquote(word):
+    if '"' not in word and "\\" not in word:
+        return word
+
+    parts = []
+    for m in _PART.finditer(word):
+        if m.group("plain") is not None:
+            parts.append(m.group("plain"))
+        elif m.group("escaped") is not None:
+            parts.append(m.group("escaped"))
+        else:
+            parts.append(_QUOTED_ESCAPE.sub(r"\1", m.group("quoted")))
+    return "".join(parts)
+
+
+def _split(line: str)->list:
+    """
+    Split a data line into its ``Key=Value`` tokens.
+    """
+    if '"' not in line and "\\" not in line and "#" not in line \
+       and line.rstrip("\r\n").isprintable():
+        return line.split()
+
+    tokens = []
+    pos = 0
+    end = len(line)
+    while pos < end:
+        m = _TOKEN.match(line, pos)
+        kind = m.lastgroup
+        if kind == "word":
+            tokens.append(_unquote(m.group()))
+        elif kind == "comment":
+            break
+        elif kind == "quote":
+            raise ValueError("No closing quotation")
+        elif kind == "escape":
+            raise ValueError("No escaped character")
+        pos = m.end()
+
+    return tokens
+
+
+def _read_line(line, table: list, item: dict=None, decoders: dict=None):
+    """
+    Parse a data line into ``table``. If the line ends with a ``_``
+    continuation, the row that the next line should extend is returned;
+    otherwise None is returned. Values of the columns in ``decoders`` are
+    decoded with the corresponding function. Keys and string values are
+    interned.
+    """
+    if item is None:
+        item = {}
+        table.append(item)
+
+    # Things are complicated by the fact we have to parse things like:
+    #    Key=Val'
+    # into "Key": "Val'"
+    #
+    tokens = _split(line)
+
+    for i,kv in enumerate(tokens):
+        if kv == "_":
+            if i == len(tokens)-1:
+                return item
+
+            # Sometimes there is a random "_" in the middle
+            # of a line?
+            else:
+                continue
+
+        k, v = kv.split("=", maxsplit=1)
+        v = decoders.get(k, _parse_value)(v) if decoders else _parse_value(v)
+
+        # Keys and names like CoordSys=GLOBAL repeat on every row; interning
+        # them keeps one copy of each and lets lookups compare by identity.
+        if type(v) is str:
+            v = sys.intern(v)
+        item[sys.intern(k)] = v
+
+    return None
+
+
+def _index_tables(data, encoding: str=None)->dict:
+    """
+    Locate every table in ``data`` (a str or bytes-like object holding
+    the whole file) without parsing any rows.
+
+    Returns
+    =======
+    A dictionary mapping each table name to a list of ``(start, stop)``
+    offsets of its data lines. A table has more than one span if its
+    name appears more than once in the file.
+    """
+    if isinstance(data, str):
+        header, final, nl = "TABLE:", "END TABLE DATA", "\n"
+    else:
+        header, final, nl = b"TABLE:", b"END TABLE DATA", b"\n"
+
+    stop = data.find(final)
+    if stop == -1:
+        stop = len(data)
+    else:
+        stop = data.rfind(nl, 0, stop) + 1
+
+    spans = []
+    pos = data.find(header, 0, stop)
+    while pos != -1:
+        start = data.rfind(nl, 0, pos) + 1
+        body  = data.find(nl, pos, stop) + 1 or stop
+        spans.append((start, body))
+        pos = data.find(header, body, stop)
+
+    index = {}
+    for i, (start, body) in enumerate(spans):
+        line = data[start:body]
+        if not isinstance(line, str):
+            line = bytes(line).decode(encoding)
+
+        name = shlex.split(line)[1]
+        end  = spans[i+1][0] if i+1 < len(spans) else stop
+        index.setdefault(name, []).append((body, end))
+
+    return index
+
+
+class LazyTables(MutableMapping):
+    """
+    A mapping with the same layout as the dictionary returned by
+    ``load``, but where each table is only parsed the first time it
+    is accessed. Instances are created by ``load(file, lazy=True)``.
+    """
+    def __init__(self, data, index: dict, encoding: str=None, columnar: bool=False):
+        self._data     = data
+        self._index    = index
+        self._encoding = encoding
+        self._columnar = columnar
+        self._tables   = {}
+
+    def _parse(self, name)->list:
+        table = []
+        decoders = _decoders(name)
+        for start, stop in self._index[name]:
+            text = self._data[start:stop]
+            if not isinstance(text, str):
+                text = bytes(text).decode(self._encoding)
+
+            item = None
+            for line_no, line in enumerate(io.StringIO(text, newline=None)):
+                if line.isspace():
+                    continue
+                try:
+                    item = _read_line(line, table, item, decoders)
+                except ValueError as e:
+                    nl = "\n" if isinstance(self._data, str) else b"\n"
+                    line_no += self._data[:start].count(nl)
+                    raise ValueError(f"Error parsing line {line_no}: " + str(e))
+
+        if self._columnar:
+            return ColumnTable.from_rows(table)
+        return table
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            if name not in self._index:
+                raise KeyError(name)
+            self._tables[name] = self._parse(name)
+        return self._tables[name]
+
+    def __setitem__(self, name, table):
+        self._tables[name] = table
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self._tables.pop(name, None)
+        self._index.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._tables or name in self._index
+
+    def __iter__(self):
+        yield from self._index
+        yield from (name for name in self._tables if name not in self._index)
+
+    def __len__(self):
+        return len(self._index) + sum(1 for name in self._tables if name not in self._index)
+
+    def close(self):
+        """
+        Release the underlying file data. Tables that have already been
+        parsed remain available.
+        """
+        if hasattr(self._data, "close"):
+            self._data.close()
+        self._data  = None
+        self._index = {name: spans for name, spans in self._index.items()
+                       if name in self._tables}
+
+    def __repr__(self):
+        return f"<LazyTables with {len(self)} tables, {len(self._tables)} parsed>"
+
+
+def _map(file):
+    """
+    Memory-map the file at path ``file`` for reading.
+    """
+    with open(file, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return b""
+
+
+def _read(file):
+    """
+    Return the bytes of ``file``: compressed files are read in full, other
+    paths are memory-mapped, and file objects are read.
+    """
+    if compressed.codec(file) is not None:
+        with compressed.open_binary(file) as f:
+            return f.read()
+    elif isinstance(file, (str, os.PathLike)):
+        return _map(file)
+    return file.read()
+
+
+def iter_rows(file, table_name: str):
+    """
+    Iterate over the rows of table ``table_name`` in ``file`` (a path or
+    file-like object) without building the tables of the whole file.
+    Only one row is held in memory at a time; rows that are continued
+    over several lines with ``_`` are yielded once complete, as in ``load``.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with compressed.open_text(file) as f:
+            yield from iter_rows(f, table_name)
+        return
+
+    rows = []
+    item = None
+    current = False
+    decoders = _decoders(table_name)
+    for line_no, line in enumerate(file):
+        if "END TABLE DATA" in line:
+            break
+
+        # Skip empty lines
+        if line.isspace():
+            continue
+
+        if "TABLE:" in line:
+            # Yield a row left open by a trailing "_"
+            yield from rows
+            rows.clear()
+            item = None
+            current = shlex.split(line)[1] == table_name
+
+        elif current:
+            try:
+                item = _read_line(line, rows, item, decoders)
+            except ValueError as e:
+                raise ValueError(f"Error parsing line {line_no}: " + str(e))
+
+            if item is None:
+                yield rows.pop()
+
+    yield from rows
+
+
+def _load_index(data, skip=None, columnar=False, encoding=None)->LazyTables:
+    index = _index_tables(data, encoding)
+    if skip is not None:
+        index = {name: spans for name, spans in index.items() if name not in skip}
+
+    return LazyTables(data, index, encoding, columnar=columnar)
+
+
+def _load_stream_index(file, skip=None, columnar=False, encoding=None)->LazyTables:
+    """
+    Index a compressed file by decompressing it once, line by line, and
+    return a LazyTables that reads each table back from a ``Stream``.
+    """
+    index = {}
+    pos   = 0
+    name  = None
+    with compressed.open_binary(file) as f:
+        for line in f:
+            if b"END TABLE DATA" in line:
+                break
+
+            if b"TABLE:" in line:
+                if name is not None:
+                    index[name].append((body, pos))
+                name = shlex.split(line.decode(encoding))[1]
+                body = pos + len(line)
+                index.setdefault(name, [])
+
+            pos += len(line)
+
+    if name is not None:
+        index[name].append((body, pos))
+
+    if skip is not None:
+        index = {name: spans for name, spans in index.items() if name not in skip}
+
+    return LazyTables(compressed.Stream(file), index, encoding, columnar=columnar)
+
+
+def load(file, append: dict=None, lazy: bool=False, skip: set=None,
+         columnar: bool=False, cache: bool=None):
     """
     Read file-like object file and form a dictionary. 
 
+    ``file`` may also be a path, in which case the file is memory-mapped,
+    its ``TABLE:`` headers are located with a bytes search, and only the
+    data of tables that are loaded is decoded. Tables named in ``skip``
+    are never parsed.
+
+    Paths ending in ``.gz``, ``.xz`` or ``.zst`` are decompressed while they
+    are read. With ``lazy=True``, the decompressed offsets of each table are
+    indexed in one pass, and tables are decompressed again when accessed.
+
+    When the on-disk cache is enabled (see ``openbim.csi.cache``), tables
+    loaded eagerly from a path are stored in it, keyed on the file contents,
+    so loading an unchanged file again skips parsing. ``cache`` overrides
+    the setting of the cache for this call. Lazy loads do not use the cache.
+
+    When ``lazy`` is True, the file is only scanned for the location of
+    each ``TABLE:`` header. The result is a ``LazyTables`` mapping that
+    parses each table on first access.
+
+    When ``columnar`` is True, each table is stored as a ``ColumnTable``
+    holding one NumPy array per column. Iterating over a ``ColumnTable``
+    still yields row dictionaries.
+
     Returns
     =======
 
@@ -37,6 +479,66 @@ def load(file, append: dict=None):
            ]
         }
     """
+    if append is not None and (lazy or columnar):
+        raise ValueError("append cannot be used with lazy or columnar loading")
+
+    encoding = locale.getpreferredencoding(False)
+
+    if not isinstance(file, (str, os.PathLike)):
+        if lazy:
+            return _load_index(file.read(), skip=skip, columnar=columnar, encoding=encoding)
+        return _load_stream(file, append=append, skip=skip, columnar=columnar)
+
+    data = _map(file)
+
+    if cache is None:
+        cache = _cache.enabled()
+
+    key = None
+    if cache and append is None and not lazy:
+        key = _cache.key(data, PARSER_VERSION, encoding=encoding, columnar=columnar,
+                         skip=tuple(sorted(skip)) if skip else None)
+        tables = _cache.get(key)
+        if tables is not None:
+            if isinstance(data, mmap.mmap):
+                data.close()
+            return tables
+
+    if compressed.codec(file) is not None:
+        # The mapped data is only used to compute the cache key
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+        if lazy:
+            return _load_stream_index(file, skip=skip, columnar=columnar, encoding=encoding)
+
+        with compressed.open_text(file, encoding=encoding) as f:
+            tables = _load_stream(f, append=append, skip=skip, columnar=columnar)
+
+        if key is not None:
+            _cache.put(key, tables)
+        return tables
+
+    index = _load_index(data, skip=skip, columnar=columnar, encoding=encoding)
+    if lazy:
+        return index
+
+    tables = {} if append is None else append
+    for table_name in index:
+        # Append if table exists (append argument given)
+        if table_name in tables:
+            tables[table_name].extend(index[table_name])
+        else:
+            tables[table_name] = index[table_name]
+    index.close()
+
+    if key is not None:
+        _cache.put(key, tables)
+
+    return tables
+
+
+def _load_stream(file, append: dict=None, skip: set=None, columnar: bool=False)->dict:
     if append is None:
         tables = {}
     else:
@@ -44,6 +546,7 @@ def load(file, append: dict=None):
 
     current_table = None
     current_item  = None
+    decoders      = None
     for line_no, line in enumerate(file):
         if "END TABLE DATA" in line:
             break
@@ -57,53 +560,28 @@ def load(file, append: dict=None):
             current_item  = None
 
             # Append if table exists (append argument given)
-            if table_name in tables:
+            if skip is not None and table_name in skip:
+                current_table = None
+            elif table_name in tables:
                 current_table = tables[table_name]
             else:
                 current_table = []
 
-            tables[table_name] = current_table
+            if current_table is not None:
+                tables[table_name] = current_table
+                decoders = _decoders(table_name)
 
 
         # Data line
         elif current_table is not None:
-
-            if current_item is None:
-
-                current_item = {}
-                current_table.append(current_item)
-
-            continue_item = False
             try:
-                # Things are complicated by the fact we have to parse things like:
-                #    Key=Val'
-                # into "Key": "Val'"
-                #
-                lex = shlex.shlex(line, posix=True)
-                lex.quotes = '"'
-                lex.wordchars += "'"
-                lex.whitespace_split = True
-                tokens = list(lex)
-#               tokens = shlex.split(line)
-            except Exception as e:
+                current_item = _read_line(line, current_table, current_item, decoders)
+            except ValueError as e:
                 raise ValueError(f"Error parsing line {line_no}: " + str(e))
 
-            for i,kv in enumerate(tokens):
-                if kv == "_":
-                    if i == len(tokens)-1:
-                        continue_item = True
-                        break
-
-                    # Sometimes there is a random "_" in the middle
-                    # of a line?
-                    else:
-                        continue
-
-                k, v = kv.split("=", maxsplit=1)
-                current_item[k] = _parse_value(v)
-
-            if not continue_item:
-                current_item = None
+    if columnar:
+        for table_name, table in tables.items():
+            tables[table_name] = ColumnTable.from_rows(table)
 
     return tables
 
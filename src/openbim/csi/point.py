@@ -5,10 +5,9 @@
 #===----------------------------------------------------------------------===#
 #
 
-from .utility import UnimplementedInstance, find_row
+from .utility import find_row
 
 def create_points(csi, model, library, config, conv):
-    log = []
     ndm = config["ndm"]
     ndf = config["ndf"]
 #   dofs = config["dofs"]
@@ -16,7 +15,11 @@ def create_points(csi, model, library, config, conv):
 
     used = set()
 
-    for node in csi["JOINT COORDINATES"]:
+    joints = csi["JOINT COORDINATES"]
+    # Tags for all joints are assigned at once
+    node_tags = conv.define_many("Joint", "node", [node["Joint"] for node in joints]).tolist()
+
+    for node, node_tag in zip(joints, node_tags):
 
         if node["CoordSys"] != "GLOBAL":
             coordinates = tuple(node[i] if i in node else 0.0 for i in ("GlobalX", "GlobalY", "GlobalZ"))
@@ -24,9 +27,6 @@ def create_points(csi, model, library, config, conv):
         else:
             coordinates = tuple(node[i] if i in node else 0.0 for i in ("XorR", "Y", "Z"))
 
-        node_tag = conv.define("Joint", "node", node["Joint"])
-
-
         model.node(node_tag, coordinates)
 
         for i,v in enumerate(dofs.values()):
@@ -52,7 +52,8 @@ def create_points(csi, model, library, config, conv):
         mass = mass + [0.0]*(ndf-len(mass))
         node_tag = conv.identify("Joint", "node", node["Joint"])
         if node["CoordSys"] != "GLOBAL":
-            conv.log(UnimplementedInstance(f"Joint.Mass.CoordSys={node['CoordSys']}", node))
+            conv.log(f"Joint.Mass.CoordSys={node['CoordSys']}", node,
+                     "JOINT ADDED MASS ASSIGNMENTS")
         model.mass(node_tag, tuple(mass))
 
     
@@ -70,15 +71,12 @@ def create_points(csi, model, library, config, conv):
     used.add("JOINT ADDED MASS BY VOLUME ASSIGNMENTS")
 
 
-    log.extend( _apply_constraints(csi, model, library, config) )
+    _apply_constraints(csi, model, library, config, conv)
 
     used.add("JOINT CONSTRAINT ASSIGNMENTS")
 
-    return log
 
-
-def _apply_constraints(sap, model, library, config):
-    log = []
+def _apply_constraints(sap, model, library, config, conv):
 
     # The format of body dictionary is {'node number':'constraint name'}
     constraints = {}
@@ -88,7 +86,7 @@ def _apply_constraints(sap, model, library, config):
             # map node number to constraint
             constraints[constraint["Joint"]] = constraint["Constraint"]
         else:
-            log.append(UnimplementedInstance("Joint.Constraint", constraint))
+            conv.log("Joint.Constraint", constraint, "JOINT CONSTRAINT ASSIGNMENTS")
 
     # Sort the dictionary by body name and return a list [(node, body name)]
     constraints = list(sorted(constraints.items(), key=lambda x: x[1]))
@@ -118,5 +116,3 @@ def _apply_constraints(sap, model, library, config):
         # After the for loop ends, write the nodes in the nodes of the last loop to the body file.
         for le in range(len(nodes)-1):
             model.eval(f"rigidLink beam {nodes[0]} {nodes[le + 1]}\n")
-
-    return log
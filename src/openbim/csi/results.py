@@ -0,0 +1,188 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Streaming reader for SAP2000 results exported to XML.
+
+Batch runs of SAP2000 export their result tables as a .NET ``DataSet``:
+
+    <NewDataSet>
+      <xs:schema id="NewDataSet"> ... </xs:schema>
+      <Joint_x0020_Displacements>
+        <Joint>1</Joint>
+        <OutputCase>DEAD</OutputCase>
+        <U1>0.0123</U1>
+        ...
+      </Joint_x0020_Displacements>
+      ...
+    </NewDataSet>
+
+where every child of the root element is one row of the table named by
+its tag, with special characters escaped as ``_xHHHH_``. The file is read
+with ``iterparse`` and each row is discarded from the element tree once
+it is read, so memory use does not depend on the size of the document.
+Values are converted with the types given by the inline schema when it is
+present, and as in ``load`` otherwise.
+
+    >>> results = load_results("Example 3-001-comp.xml")
+    >>> results["Joint Displacements"].column("U1")
+    array([0.    , 0.0123, ...])
+"""
+import os
+import re
+from xml.etree.ElementTree import iterparse
+
+from .. import compressed
+from .parse import _parse_value, _parse_string
+from .columns import ColumnTable
+
+_XS = "{http://www.w3.org/2001/XMLSchema}"
+
+_ESCAPE = re.compile(r"_x([0-9A-Fa-f]{4}|[0-9A-Fa-f]{8})_")
+
+
+def _decode_name(name: str)->str:
+    """
+    Undo the escaping of XML names by .NET (``XmlConvert.EncodeName``).
+    """
+    if "_x" not in name:
+        return name
+    return _ESCAPE.sub(lambda m: chr(int(m.group(1), 16)), name)
+
+
+def _parse_bool(v):
+    return v in {"true", "1", "Yes"}
+
+def _parse_int(v):
+    try:
+        return int(v)
+    except ValueError:
+        return _parse_value(v)
+
+def _parse_float(v):
+    try:
+        return float(v)
+    except ValueError:
+        return _parse_value(v)
+
+_TYPES = {
+    "boolean": _parse_bool,
+    "byte":    _parse_int,
+    "short":   _parse_int,
+    "int":     _parse_int,
+    "integer": _parse_int,
+    "long":    _parse_int,
+    "float":   _parse_float,
+    "double":  _parse_float,
+    "decimal": _parse_float,
+    "string":  str,
+}
+
+
+def _read_schema(schema)->dict:
+    """
+    Return a dictionary mapping each table tag in an inline ``xs:schema``
+    element to a dictionary from column tag to decoder.
+    """
+    tables = {}
+    for element in schema.iter(_XS + "element"):
+        sequence = element.find(f"{_XS}complexType/{_XS}sequence")
+        if sequence is None:
+            continue
+        columns = {}
+        for column in sequence.iter(_XS + "element"):
+            kind = column.get("type", "").rpartition(":")[2]
+            if kind in _TYPES:
+                columns[column.get("name")] = _TYPES[kind]
+        tables[element.get("name")] = columns
+    return tables
+
+
+def _iter_rows(file, tables: set=None):
+    """
+    Yield ``(table_name, row)`` for every row in ``file``, or only for the
+    rows of the tables named in ``tables``.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with compressed.open_binary(file) as f:
+            yield from _iter_rows(f, tables)
+        return
+
+    schemas = {}
+    names   = {}
+    depth   = 0
+    root    = None
+    events  = iterparse(file, events=("start", "end"))
+    for event, element in events:
+        if event == "start":
+            if depth == 0:
+                root = element
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth != 1:
+            continue
+
+        tag = element.tag
+        if tag == _XS + "schema":
+            schemas.update(_read_schema(element))
+
+        else:
+            if tag not in names:
+                names[tag] = _decode_name(tag)
+            name = names[tag]
+
+            if tables is None or name in tables:
+                decoders = schemas.get(tag, {})
+                row = {}
+                for column in element:
+                    key = column.tag
+                    if key not in names:
+                        names[key] = _decode_name(key)
+                    # _parse_string gives the same value as _parse_value
+                    # without trying json.loads on plain words
+                    row[names[key]] = decoders.get(key, _parse_string)(column.text or "")
+                yield name, row
+
+        # Rows are not needed once read
+        root.clear()
+
+
+def iter_results(file, table_name: str):
+    """
+    Yield the rows of table ``table_name`` in the XML results ``file`` as
+    dictionaries, one at a time.
+    """
+    for _, row in _iter_rows(file, {table_name}):
+        yield row
+
+
+def load_results(file, tables: set=None, columnar: bool=True)->dict:
+    """
+    Load the result tables of a SAP2000 XML export.
+
+    Parameters
+    ==========
+    file:      path or binary file object of the ``.xml`` file. Paths
+               ending in ``.gz``, ``.xz`` or ``.zst`` are decompressed.
+    tables:    names of the tables to load; all tables by default.
+    columnar:  if True, each table is returned as a ``ColumnTable``;
+               otherwise as a list of row dictionaries, like ``load``.
+
+    Returns
+    =======
+    A dictionary mapping table names (e.g. ``"Joint Displacements"``) to
+    their rows.
+    """
+    results = {}
+    for name, row in _iter_rows(file, tables):
+        results.setdefault(name, []).append(row)
+
+    if columnar:
+        for name, rows in results.items():
+            results[name] = ColumnTable.from_rows(rows)
+    return results
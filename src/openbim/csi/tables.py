@@ -1,35 +1,277 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+
+class LookupProfile:
+    """
+    Number of lookups, rows scanned and time spent for each table and set
+    of key columns. Rows are counted when a table is scanned, either to
+    search it or to build an index.
+    """
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, table, keys: tuple, scanned: int, seconds: float):
+        entry = self.stats.get((table, keys), None)
+        if entry is None:
+            self.stats[(table, keys)] = [1, scanned, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += scanned
+            entry[2] += seconds
+
+    def report(self, file=None):
+        if file is None:
+            file = sys.stderr
+
+        print("Table lookups", file=file)
+        for (table, keys), (count, scanned, seconds) in sorted(self.stats.items(),
+                                                             key=lambda item: -item[1][2]):
+            print(f"\t{table or '(unnamed)'} [{', '.join(keys)}]: {count} lookups, "
+                  f"{scanned} rows scanned, {seconds*1e3:.2f} ms", file=file)
+
+
+# Profiling is enabled with the OPENBIM_PROFILE environment variable or
+# the profile() context manager.
+_PROFILE = LookupProfile() if os.environ.get("OPENBIM_PROFILE", "0") not in {"0", "", "false", "False", "no"} \
+           else None
+
+
+def active_profile()->LookupProfile:
+    """
+    Return the profile that lookups are currently recorded in, or None.
+    """
+    return _PROFILE
+
+
+@contextmanager
+def profile():
+    """
+    Record lookups in a new ``LookupProfile`` for the duration of a
+    ``with`` block:
+
+        >>> with profile() as stats:
+        ...     model = create_model(csi)
+        >>> stats.report()
+    """
+    global _PROFILE
+    previous = _PROFILE
+    _PROFILE = LookupProfile()
+    try:
+        yield _PROFILE
+    finally:
+        _PROFILE = previous
+
+
+def _scan(rows, kwds)->list:
+    matches = []
+    for row in rows:
+        match = True
+        for k, v in kwds.items():
+            if k not in row or row[k] != v:
+                match = False
+                break
+
+        if match:
+            matches.append(row)
+
+    return matches
+
+
+class Table(Sequence):
+    """
+    A view of the rows of one table that answers equality queries with
+    hash indexes.
+
+    The first query on a set of columns builds an index from the values
+    of those columns to the matching rows, and later queries on the same
+    columns are dictionary lookups. Indexes are rebuilt when the number of
+    rows changes; changing the values of a row that was already indexed is
+    not detected.
+    """
+    def __init__(self, rows, name: str=None):
+        self.name     = name
+        self._rows    = rows
+        self._indexes = {}
+        self._arrays  = {}
+        self._scanned = 0
+
+    def _index(self, keys: tuple):
+        entry = self._indexes.get(keys, None)
+        if entry is not None and entry[0] == len(self._rows):
+            return entry[1]
+
+        self._scanned += len(self._rows)
+        index = {}
+        try:
+            for row in self._rows:
+                try:
+                    key = tuple(row[k] for k in keys)
+                except KeyError:
+                    continue
+                if key in index:
+                    index[key].append(row)
+                else:
+                    index[key] = [row]
+
+        except TypeError:
+            # Unhashable values (e.g., lists); fall back to scanning
+            index = None
+
+        self._indexes[keys] = (len(self._rows), index)
+        return index
+
+    def _lookup(self, kwds)->list:
+        if _PROFILE is None:
+            return self._search(kwds)
+
+        scanned = self._scanned
+        start   = time.perf_counter()
+        rows    = self._search(kwds)
+        _PROFILE.record(self.name, tuple(sorted(kwds)), self._scanned - scanned,
+                        time.perf_counter() - start)
+        return rows
 
-class Tables:
-    def __init__(data: dict):
-        self.data = data
-
-    def any(self, table, **kwds)->dict:
-        pass
-
-    def get(self, table, _default, **kwds)->dict:
-        for row in self.data:
-            match = True
-            for k, v in kwds.items():
-                if k not in row or row[k] != v:
-                    match = False
-                    break
-
-            if match:
-                return row
+    def _search(self, kwds)->list:
+        keys  = tuple(sorted(kwds))
+        index = self._index(keys)
+        if index is not None:
+            try:
+                return index.get(tuple(kwds[k] for k in keys), [])
+            except TypeError:
+                pass
+        self._scanned += len(self._rows)
+        return _scan(self._rows, kwds)
+
+    def find(self, **kwds)->dict:
+        """
+        Return the first row whose values equal ``kwds``, or None.
+        """
+        rows = self._lookup(kwds)
+        if rows:
+            return rows[0]
+
+    def find_all(self, **kwds)->list:
+        """
+        Return all rows whose values equal ``kwds``, in table order.
+        """
+        return list(self._lookup(kwds))
+
+    def group(self, *keys)->dict:
+        """
+        Return a dictionary mapping each tuple of values of the columns
+        ``keys`` (e.g. ``("SectionName", "ShapeName")``) to the rows that
+        have them, in table order. The dictionary is built once and shared;
+        it must not be modified.
+        """
+        index = self._index(keys)
+        if index is None:
+            raise TypeError(f"values of {keys} are not hashable")
+        return index
+
+    def arrays(self, keys: tuple, columns: tuple)->dict:
+        """
+        Return a dictionary mapping each group of ``group(*keys)`` to a
+        read-only, contiguous ``float`` array with one row per table row
+        and one column per name in ``columns``, e.g. the ``("X", "Y")``
+        coordinates of the vertices of each polygon.
+        """
+        entry = self._arrays.get((keys, columns), None)
+        if entry is not None and entry[0] == len(self._rows):
+            return entry[1]
+
+        arrays = {}
+        for key, rows in self.group(*keys).items():
+            array = np.array([[row[c] for c in columns] for row in rows], dtype=float)
+            array.flags.writeable = False
+            arrays[key] = array
+
+        self._arrays[(keys, columns)] = (len(self._rows), arrays)
+        return arrays
+
+    def __getitem__(self, i):
+        return self._rows[i]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __repr__(self):
+        return f"<Table with {len(self._rows)} rows and {len(self._indexes)} indexes>"
+
+
+def get_table(csi, name: str)->Table:
+    """
+    Return table ``name`` of ``csi`` as a ``Table``, or an empty ``Table``
+    if ``csi`` has no such table. Plain dictionaries from ``load`` are
+    indexed too; for a ``Tables`` object the shared view is returned.
+    """
+    table = csi.get(name, [])
+    return table if isinstance(table, Table) else Table(table, name)
+
+
+class Tables(Mapping):
+    """
+    Query engine over the tables returned by ``load``.
+
+    ``tables[name]`` returns a ``Table`` view of each table, which is
+    created once and keeps its indexes for the life of this object, so
+    that repeated lookups with ``find_row``/``find_rows`` (or the methods
+    below) take constant time instead of scanning the table.
+
+    ``cache`` holds data derived from the tables (e.g. joins) that is
+    shared by the converters; it is not updated if the tables change.
+    """
+    def __init__(self, data: dict):
+        self.data    = data
+        self.cache   = {}
+        self._tables = {}
+
+    def __getitem__(self, name)->Table:
+        if name not in self._tables:
+            table = self.data[name]
+            self._tables[name] = table if isinstance(table, Table) else Table(table, name)
+        return self._tables[name]
+
+    def __contains__(self, name):
+        return name in self.data
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def any(self, table, **kwds)->bool:
+        """
+        Return True if ``table`` has a row whose values equal ``kwds``.
+        """
+        return table in self and self[table].find(**kwds) is not None
+
+    def find(self, table, _default=None, **kwds)->dict:
+        """
+        Return the first row of ``table`` whose values equal ``kwds``, or
+        ``_default`` if there is none.
+        """
+        if table not in self:
+            return _default
+        row = self[table].find(**kwds)
+        return _default if row is None else row
 
     def all(self, table, **kwds)->list:
-        rows = []
-        for row in table:
-            match = True
-            for k, v in kwds.items():
-                if k not in row or row[k] != v:
-                    match = False
-                    break
-
-            if match:
-                rows.append(row)
-
-        return rows
+        """
+        Return all rows of ``table`` whose values equal ``kwds``.
+        """
+        if table not in self:
+            return []
+        return self[table].find_all(**kwds)
 
 
 _Tables = {
@@ -1,4 +1,7 @@
+import time
 
+from ..diagnostics import Diagnostics
+from .tables import Table, _scan, active_profile
 
 class Log:
     def append(self, table, field, object):
@@ -14,15 +17,48 @@ class UnimplementedInstance:
         return f"{self.name}: {self.object}"
 
 def print_log(log):
+    """
+    Print the number of unimplemented features of each kind in ``log``, a
+    ``Diagnostics`` collector or a list of ``UnimplementedInstance``.
+    """
     import sys
 
-    types = {i.name for i in log}
+    if not isinstance(log, Diagnostics):
+        diagnostics = Diagnostics(samples=0)
+        diagnostics.extend(log)
+        log = diagnostics
 
     print("Unimplemented features", file=sys.stderr)
-    for item in types:
-        print(f"\t{item}: {sum(1 for i in log if i.name == item)}", file=sys.stderr)
+    for item, count in log.counts.items():
+        print(f"\t{item}: {count}", file=sys.stderr)
+
+def _profiled(table, kwds, first):
+    # Linear search of a plain list, recorded in the active profile
+    start   = time.perf_counter()
+    scanned = 0
+    rows    = []
+    for row in table:
+        scanned += 1
+        if all(k in row and row[k] == v for k, v in kwds.items()):
+            rows.append(row)
+            if first:
+                break
+
+    active_profile().record(None, tuple(sorted(kwds)), scanned, time.perf_counter() - start)
+    return rows
+
 
 def find_row(table, **kwds) -> dict:
+    """
+    Return the first row of ``table`` whose values equal ``kwds``, or None.
+    Tables obtained from a ``Tables`` object are searched with an index.
+    """
+    if isinstance(table, Table):
+        return table.find(**kwds)
+
+    if active_profile() is not None:
+        rows = _profiled(table, kwds, first=True)
+        return rows[0] if rows else None
 
     for row in table:
         match = True
@@ -36,16 +72,13 @@ def find_row(table, **kwds) -> dict:
 
 
 def find_rows(table, **kwds) -> list:
-    rows = []
-    for row in table:
-        match = True
-        for k, v in kwds.items():
-            if k not in row or row[k] != v:
-                match = False
-                break
+    """
+    Return all rows of ``table`` whose values equal ``kwds``.
+    """
+    if isinstance(table, Table):
+        return table.find_all(**kwds)
 
-        if match:
-            rows.append(row)
-
-    return rows
+    if active_profile() is not None:
+        return _profiled(table, kwds, first=False)
 
+    return _scan(table, kwds)
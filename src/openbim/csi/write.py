@@ -0,0 +1,199 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Write CSI tables back to ``.s2k``/``.b2k`` text files.
+
+``dump`` writes the dictionary returned by ``load`` one row at a time, so
+the text of the whole file is never held in memory. Values are formatted
+so that loading the written file gives back the same tables:
+
+    >>> csi = load("Tower.s2k")
+    >>> for row in csi["FRAME SECTION ASSIGNMENTS"]:
+    ...     row["AnalSect"] = "FSEC2"
+    >>> dump(csi, "Tower-FSEC2.s2k")
+
+With ``update=True``, only the tables in ``tables`` are rewritten, and
+the text of every other table is copied from the existing file unchanged.
+"""
+import os
+import json
+import math
+import locale
+
+from .. import compressed
+from .parse import LazyTables, _index_tables, _read, _parse_string
+
+# Width at which rows are wrapped onto continuation lines
+WIDTH = 240
+
+_INDENT   = "   "
+_CONTINUE = "        "
+_SPECIAL  = set(' \t\r\n"\\#')
+
+
+def _quote(text: str, force: bool=False)->str:
+    if not force and text and text.isprintable() and not _SPECIAL.intersection(text):
+        return text
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _format_value(value)->str:
+    """
+    Format ``value`` so that it is parsed back to an equal value.
+    """
+    if value is True:
+        return "Yes"
+    elif value is False:
+        return "No"
+    elif isinstance(value, str):
+        parsed = _parse_string(value)
+        if type(parsed) is str and parsed == value:
+            return _quote(value)
+        # Strings like "1" or "Yes" are written as JSON strings
+        return _quote(json.dumps(value, ensure_ascii=False))
+    elif isinstance(value, float) and math.isfinite(value):
+        return repr(value)
+    return _quote(json.dumps(value, ensure_ascii=False, separators=(",", ":")))
+
+
+def _format_row(row: dict, width: int=WIDTH):
+    """
+    Yield the lines of one row, wrapped with ``_`` continuations.
+    """
+    line = _INDENT
+    for key, value in row.items():
+        token = f"{key}={_format_value(value)}"
+        if line.strip() and len(line) + len(_INDENT) + len(token) + 2 > width:
+            yield line + " _"
+            line = _CONTINUE + token
+        elif line.strip():
+            line += _INDENT + token
+        else:
+            line += token
+    yield line
+
+
+def _format_rows(rows, width: int=WIDTH):
+    """
+    Yield the data lines of a table, followed by the blank line that
+    separates it from the next table.
+    """
+    for row in rows:
+        yield from _format_row(row, width)
+    yield " "
+
+
+def _format_header(name: str)->str:
+    return f"TABLE:  {_quote(name, force=True)}"
+
+
+def _modified(tables):
+    # Tables of a LazyTables that were never accessed cannot have changed
+    if isinstance(tables, LazyTables):
+        return {name: tables[name] for name in tables._tables}
+    return tables
+
+
+def _update(tables, file, width, encoding):
+    data  = _read(file)
+    index = _index_tables(data, encoding)
+    nl    = b"\r\n" if b"\r\n" in data[:4096] else b"\n"
+
+    def write(f, lines):
+        for line in lines:
+            f.write(line.encode(encoding) + nl)
+
+    # (header, body, stop, name) of every part of a table, in file order
+    spans = sorted(
+        (data.rfind(b"\n", 0, start - 1) + 1, start, stop, name)
+        for name, parts in index.items()
+        for start, stop in parts
+    )
+    final = spans[-1][2] if spans else len(data)
+
+    # Write next to the original and swap it in once complete
+    temp = f"{os.fspath(file)}.{os.getpid()}.tmp{compressed.codec(file) or ''}"
+    try:
+        with compressed.open_binary(temp, "wb") as f:
+            pos = 0
+            written = set()
+            for header, start, stop, name in spans:
+                if name not in tables:
+                    continue
+                f.write(data[pos:header])
+                if name not in written:
+                    # Keep the original header line
+                    f.write(data[header:start])
+                    write(f, _format_rows(tables[name], width))
+                    written.add(name)
+                # Later parts of a rewritten table are dropped
+                pos = stop
+
+            f.write(data[pos:final])
+            for name, rows in tables.items():
+                if name not in index:
+                    write(f, [_format_header(name)])
+                    write(f, _format_rows(rows, width))
+
+            if final < len(data):
+                f.write(data[final:])
+            else:
+                write(f, ["END TABLE DATA"])
+
+    except BaseException:
+        try:
+            os.remove(temp)
+        except OSError:
+            pass
+        raise
+
+    finally:
+        if hasattr(data, "close"):
+            data.close()
+
+    os.replace(temp, file)
+
+
+def dump(tables: dict, file, update: bool=False, width: int=WIDTH, title: str=None):
+    """
+    Write ``tables`` to ``file`` in the CSI text format.
+
+    Parameters
+    ==========
+    tables:  dictionary mapping table names to lists of rows (or
+             ``ColumnTable``s), as returned by ``load``.
+    file:    path or text file object to write to. Paths ending in ``.gz``,
+             ``.xz`` or ``.zst`` are compressed.
+    update:  if True, ``file`` must be the path of an existing model. Only
+             the tables in ``tables`` are rewritten in place, tables that
+             are not in the file are added at its end, and the text of all
+             other tables is kept as is. When ``tables`` is a lazy mapping
+             from ``load(file, lazy=True)``, only the tables that were
+             accessed or assigned are rewritten.
+    width:   length at which rows are wrapped onto continuation lines.
+    title:   first line of the file.
+    """
+    encoding = locale.getpreferredencoding(False)
+
+    if update:
+        if not isinstance(file, (str, os.PathLike)):
+            raise ValueError("update requires the path of an existing file")
+        return _update(_modified(tables), file, width, encoding)
+
+    if isinstance(file, (str, os.PathLike)):
+        # CSI programs write Windows line endings
+        with compressed.open_text(file, encoding=encoding, mode="w", newline="\r\n") as f:
+            return dump(tables, f, width=width, title=title)
+
+    if title is None:
+        title = "File was saved by openbim"
+    file.write(title + "\n \n")
+    for name, rows in tables.items():
+        file.write(_format_header(name) + "\n")
+        for line in _format_rows(rows, width):
+            file.write(line + "\n")
+    file.write("END TABLE DATA\n")
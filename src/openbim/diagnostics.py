@@ -0,0 +1,128 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Aggregated diagnostics of a model conversion.
+
+Conversions report every row they cannot convert. ``Diagnostics`` counts
+the reports in each category (e.g. ``"Frame.Curve"``) and keeps copies of
+only the first few rows of each, so that its size depends on the number
+of categories and not on the number of rows:
+
+    >>> diagnostics = Diagnostics(samples=2)
+    >>> for frame in csi["CONNECTIVITY - FRAME"]:
+    ...     diagnostics.record("Frame.Curve", frame, "CONNECTIVITY - FRAME")
+    >>> diagnostics.counts
+    {'Frame.Curve': 1200}
+    >>> diagnostics.dump("diagnostics.json")
+"""
+import os
+import json
+
+# Number of rows kept for each category
+SAMPLES = 5
+
+
+def _copy(object):
+    # Copy rows so that samples do not share state with the source tables
+    if isinstance(object, dict):
+        return dict(object)
+    return object
+
+
+class Diagnostics:
+    """
+    Per-category counters with a bounded sample of the offending rows.
+
+    Parameters
+    ==========
+    samples:  maximum number of rows kept for each category.
+    """
+    def __init__(self, samples: int=SAMPLES):
+        self._limit  = samples
+        self.counts  = {}
+        # category -> list of (table, row)
+        self.samples = {}
+
+    def record(self, name: str, object=None, table: str=None):
+        """
+        Count one occurrence of ``name``, caused by ``object`` (usually a
+        row of the table named ``table``).
+        """
+        count = self.counts.get(name, 0)
+        self.counts[name] = count + 1
+        if count < self._limit:
+            self.samples.setdefault(name, []).append((table, _copy(object)))
+
+    def append(self, item):
+        """
+        Record ``item``, which is either a category name or an object with
+        ``name``, ``object`` and ``table`` attributes like
+        ``UnimplementedInstance``.
+        """
+        if isinstance(item, str):
+            self.record(item)
+        else:
+            self.record(item.name, getattr(item, "object", None), getattr(item, "table", None))
+
+    def extend(self, items):
+        """
+        Record each of ``items``, or merge ``items`` if it is a
+        ``Diagnostics`` collector.
+        """
+        if isinstance(items, Diagnostics):
+            return self.merge(items)
+        for item in items:
+            self.append(item)
+
+    def merge(self, other: "Diagnostics"):
+        """
+        Add the counts and samples of ``other`` to this collector.
+        """
+        for name, count in other.counts.items():
+            samples = self.samples.setdefault(name, [])
+            room = self._limit - len(samples)
+            samples.extend(other.samples.get(name, [])[:max(room, 0)])
+            if not samples:
+                del self.samples[name]
+            self.counts[name] = self.counts.get(name, 0) + count
+
+    def to_dict(self)->dict:
+        """
+        Return the counts and samples as a JSON-serializable dictionary.
+        """
+        return {
+            "total": len(self),
+            "categories": {
+                name: {
+                    "count": count,
+                    "samples": [
+                        {"table": table, "row": object}
+                        for table, object in self.samples.get(name, [])
+                    ]
+                } for name, count in sorted(self.counts.items())
+            }
+        }
+
+    def dump(self, file, **kwds):
+        """
+        Write ``to_dict()`` as JSON to ``file``, a path or text file object.
+        """
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "w") as f:
+                return self.dump(f, **kwds)
+
+        # Values that are not JSON types are written with their repr
+        json.dump(self.to_dict(), file, default=repr, **kwds)
+
+    def __len__(self):
+        return sum(self.counts.values())
+
+    def __bool__(self):
+        return bool(self.counts)
+
+    def __repr__(self):
+        return f"<Diagnostics {len(self)} in {len(self.counts)} categories>"
@@ -0,0 +1,422 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Write a ``ModelIR`` directly in the formats of OpenSees, without creating
+the model in an interpreter.
+
+``dump_json`` writes the same document as ``model.print("-json")`` would
+for the model that ``emit`` creates from the IR, except that materials,
+sections and transformations are listed in the order they are defined:
+
+    >>> ir, conv = create_ir(csi)
+    >>> with open("model.json", "w") as f:
+    ...     dump_json(ir, f)
+
+Only the objects produced by the CSI converter for elastic models are
+supported. When ``ir`` contains any other object, ``NotImplementedError``
+is raised before anything is written, and the model should be created
+with ``emit`` and printed by OpenSees instead.
+
+``dump_tcl`` writes a Tcl script that creates the model, in the order
+that ``emit`` creates it. Consecutive commands that differ only in some
+of their arguments are written as ``foreach`` loops over those arguments.
+"""
+import sys
+
+import numpy as np
+
+from .ir import ModelIR, tcl_words
+
+# Objects are written to the file in batches of this many lines
+BATCH = 1024
+
+# Runs of fewer commands than this are not written as loops
+LOOP = 4
+
+_INDENT = "       "
+
+
+def _g(value)->str:
+    # OpenSees prints doubles with the default stream precision
+    return format(float(value), ".6g")
+
+
+def _list(values)->str:
+    return "[" + ", ".join(map(_g, values)) + "]"
+
+
+def _unsupported(what):
+    raise NotImplementedError(f"JSON export of {what} is not supported")
+
+
+class _Definitions:
+    """
+    Materials, sections and transformations of a ``ModelIR``, formatted
+    as JSON objects.
+    """
+    def __init__(self, ir: ModelIR):
+        self.materials = {}
+        self.sections  = {}
+        # tag -> keyword arguments of FrameElastic sections
+        self.frame_sections = {}
+
+        for method, args, kwds in ir.calls:
+            if method == "eval":
+                words = args[0].split()
+                if len(words) >= 5 and words[:2] == ["material", "ElasticIsotropic"]:
+                    self._material(*words[2:])
+                else:
+                    _unsupported(f"command '{args[0].strip()}'")
+
+            elif method in {"nDMaterial", "material"} and args and args[0] == "ElasticIsotropic" and not kwds:
+                self._material(*args[1:])
+
+            elif method == "section" and args and args[0] == "FrameElastic":
+                self._frame_section(*args[1:], **kwds)
+
+            elif method == "section" and args and args[0] == "ElasticShell" and not kwds:
+                self._shell_section(*args[1:])
+
+            else:
+                _unsupported(f"{method} {args[0] if args else ''}")
+
+        self.transforms = {}
+        types, tags, vectors = ir.transforms
+        for type, tag, vecxz in zip(types, tags.tolist(), vectors.tolist()):
+            if type != "Linear" or vecxz[0] != vecxz[0] or tag in self.transforms:
+                _unsupported(f"geomTransf {type} {tag}")
+            self.transforms[tag] = (
+                f'{{"name": {tag}, "type": "LinearFrameTransf", "vecxz": {_list(vecxz)}}}'
+            )
+
+    def _material(self, tag, E, nu, rho=0.0):
+        tag = int(tag)
+        if tag in self.materials:
+            _unsupported(f"redefinition of material {tag}")
+        self.materials[tag] = (
+            f'{{"name": "{tag}", "type": "ElasticIsotropicThreeDimensional",'
+            f' "E": {_g(E)}, "nu": {_g(nu)}, "rho": {_g(rho)}}}'
+        )
+
+    def _frame_section(self, tag, **kwds):
+        if tag in self.sections or set(kwds) != {"A", "Ay", "Az", "Iy", "Iz", "J", "E", "G"}:
+            _unsupported(f"section FrameElastic {tag}")
+        self.frame_sections[tag] = kwds
+        s = kwds
+        self.sections[tag] = (
+            f'{{"name": {tag}, "type": "ElasticFrameSection3d",'
+            f' "E": {_g(s["E"])}, "G": {_g(s["G"])}, "A": {_g(s["A"])},'
+            f' "Ay": {_g(s["Ay"])}, "Az": {_g(s["Az"])},'
+            f' "Iy": {_g(s["Iy"])}, "Iz": {_g(s["Iz"])}, "Jx": {_g(s["J"])},'
+            f' "Ca": {_g(s["Iy"] + s["Iz"] - s["J"])}, "Cw": 0}}'
+        )
+
+    def _shell_section(self, tag, E, nu, thickness, rho=0.0):
+        if tag in self.sections:
+            _unsupported(f"redefinition of section {tag}")
+        self.sections[tag] = (
+            f'{{"name": "{tag}", "type": "ElasticMembranePlateSection",'
+            f' "Em": {_g(E)}, "Ep": {_g(E)}, "nu": {_g(nu)},'
+            f' "thickness": {_g(thickness)}, "masspervolume": {_g(rho)}}}'
+        )
+
+
+def _prism_frame(block, i, tag, nodes, definitions):
+    args, values = block.arguments[i]
+    kwds = dict(zip(block.keywords, values))
+    section = definitions.frame_sections[kwds["section"]]
+    # The element stores GJ and the shear stiffness of the section
+    G  = section["G"]*section["Az"]/section["A"]
+    Jx = section["G"]*section["J"]/G
+    return (
+        f'{{"name": {tag}, "type": "PrismFrame3d", "nodes": {_list(nodes)},'
+        f' "massperlength": {_g(kwds.get("mass", 0.0))}, "releasez": 0, "releasey": 0,'
+        f' "transform": {kwds["transform"]}, "shear_flag": 0, "section": {kwds["section"]},'
+        f' "E": {_g(section["E"])}, "G": {_g(G)}, "A": {_g(section["A"])}, "Ay": 0, "Az": 0,'
+        f' "Jx": {_g(Jx)}, "Iy": {_g(section["Iy"])}, "Iz": {_g(section["Iz"])}}}'
+    )
+
+
+def _check_prism_frame(block, definitions):
+    if block.nen != 2 or not set(block.keywords) <= {"section", "transform", "mass"} \
+            or not {"section", "transform"} <= set(block.keywords):
+        _unsupported(f"element {block.type}")
+    for args, values in block.arguments:
+        kwds = dict(zip(block.keywords, values))
+        section = definitions.frame_sections.get(kwds["section"], None)
+        if args or section is None or kwds["transform"] not in definitions.transforms \
+                or section["A"] == 0 or section["Az"] == 0 or section["G"] == 0:
+            _unsupported(f"element {block.type} with section {kwds['section']}")
+
+
+def _shell(block, i, tag, nodes, definitions):
+    section = block.arguments[i][0][0]
+    if block.type == "ShellMITC4":
+        return (f'{{"name": {tag}, "type": "ShellMITC4",'
+                f' "nodes": {_list(nodes)}, "sections": [{section}]}}')
+    return (f'{{"name": {tag}, "type": "ShellNLDKGT",'
+            f' "nodes": {_list(nodes)}, "section": "{section}"}}')
+
+
+def _check_shell(block, definitions):
+    if block.keywords or block.nen != {"ShellMITC4": 4, "ShellNLDKGT": 3}[block.type]:
+        _unsupported(f"element {block.type}")
+    for args, values in block.arguments:
+        if len(args) != 1 or args[0] not in definitions.sections \
+                or args[0] in definitions.frame_sections:
+            _unsupported(f"element {block.type} with section {args}")
+
+
+# type: (check, format, indent)
+ELEMENTS = {
+    "PrismFrame":  (_check_prism_frame, _prism_frame, _INDENT),
+    "ShellMITC4":  (_check_shell,       _shell,       _INDENT),
+    # OpenSees indents these with tabs
+    "ShellNLDKGT": (_check_shell,       _shell,       "\t\t\t"),
+}
+
+
+def _array(name, lines, file, indent="    "):
+    file.write(f'{indent}"{name}": [\n')
+    first = True
+    batch = []
+    for line in lines:
+        if not first:
+            batch.append(",\n")
+        batch.append(line)
+        first = False
+        if len(batch) >= BATCH:
+            file.write("".join(batch))
+            batch.clear()
+    file.write("".join(batch))
+    file.write(f'\n{indent}]')
+
+
+def dump_json(ir: ModelIR, file=None):
+    """
+    Write ``ir`` to ``file`` in the OpenSees JSON format of
+    ``model.print("-json")``.
+
+    Parameters
+    ==========
+    ir:    model to write.
+    file:  text file object; defaults to ``sys.stdout``.
+    """
+    if file is None:
+        file = sys.stdout
+
+    #
+    # Check everything before writing, so that nothing is written when
+    # the model has to be printed by OpenSees instead
+    #
+    if ir.ndm != 3:
+        _unsupported(f"models with ndm={ir.ndm}")
+
+    definitions = _Definitions(ir)
+
+    tags = ir.node_tags
+    if len(set(tags.tolist())) != len(tags):
+        _unsupported("duplicate nodes")
+    nodes = set(tags.tolist())
+
+    for block in ir.elements.values():
+        if block.type not in ELEMENTS:
+            _unsupported(f"element {block.type}")
+        ELEMENTS[block.type][0](block, definitions)
+        if not set(block.connectivity.ravel().tolist()) <= nodes:
+            _unsupported(f"element {block.type} with undefined nodes")
+
+    element_tags = [tag for block in ir.elements.values() for tag in block.tags.tolist()]
+    if len(set(element_tags)) != len(element_tags):
+        _unsupported("duplicate elements")
+
+    # Single point constraints, in the order they are created
+    constraints = []
+    fixed = set()
+    for tag, dof, row in zip(*(a.tolist() for a in ir.fix_records)):
+        if tag not in nodes:
+            _unsupported(f"constraint of undefined node {tag}")
+        dofs = [dof] if dof else [j+1 for j in range(ir.ndf) if row[j]]
+        for dof in dofs:
+            if (tag, dof) in fixed:
+                _unsupported(f"repeated constraint of node {tag}")
+            fixed.add((tag, dof))
+            constraints.append((tag, dof))
+
+    masses = {}
+    for tag, row in zip(*(a.tolist() for a in ir.mass_records)):
+        if tag not in nodes:
+            _unsupported(f"mass of undefined node {tag}")
+        masses[tag] = row
+
+    #
+    # Properties, in the order they are defined. OpenSees lists them in
+    # the order of its hash tables, which is not meaningful.
+    #
+    file.write('{\n"StructuralAnalysisModel": {\n  "properties": {\n')
+    _array("sections", (_INDENT + s for s in definitions.sections.values()), file)
+    file.write(",\n")
+    _array("nDMaterials", (_INDENT + m for m in definitions.materials.values()), file)
+    file.write(',\n    "uniaxialMaterials": [\n\n    ],\n')
+    _array("crdTransformations", (_INDENT + t for t in definitions.transforms.values()), file)
+    file.write(',\n    "patterns": [\n\n    ],\n'
+               '    "damping": {\n\n    },\n'
+               '    "parameters": [\n\n    ]\n\n  },\n')
+
+    #
+    # Geometry
+    #
+    file.write('  "geometry": {\n')
+    order = tags.argsort(kind="stable")
+    coordinates = ir.coordinates
+    def _nodes():
+        for i in order.tolist():
+            tag = int(tags[i])
+            line = (f'{_INDENT}{{"name": {tag}, "ndf": {ir.ndf},'
+                    f' "crd": {_list(coordinates[i].tolist())}, "rotation": "none"')
+            if tag in masses:
+                line += f', "mass": {_list(masses[tag])}'
+            yield line + "}"
+    _array("nodes", _nodes(), file)
+    file.write(",\n")
+
+    def _elements():
+        blocks = list(ir.elements.values())
+        tags   = [block.tags.tolist() for block in blocks]
+        nodes  = [block.connectivity.tolist() for block in blocks]
+        rows = sorted(
+            (tag, b, i) for b in range(len(blocks)) for i, tag in enumerate(tags[b])
+        )
+        for tag, b, i in rows:
+            _, write, indent = ELEMENTS[blocks[b].type]
+            yield indent + write(blocks[b], i, tag, nodes[b][i], definitions)
+    _array("elements", _elements(), file)
+    file.write(",\n")
+
+    _array("constraints", (
+        f'{_INDENT}{{"name": {i}, "node": {tag}, "dof": {dof}, "ref_value": 0}}'
+        for i, (tag, dof) in enumerate(constraints)
+    ), file)
+    file.write("\n  }\n}\n}\n")
+
+
+#
+# Tcl
+#
+def _loop(head, rows, names)->str:
+    # Write rows of the same shape as one foreach over the columns that vary
+    columns = [j for j in range(len(rows[0])) if any(row[j] != rows[0][j] for row in rows)]
+    if not columns:
+        return "".join(f"{head} {' '.join(row)}\n" for row in rows)
+
+    variables = {}
+    for j in columns:
+        name = names[j] if j < len(names) else f"x{j}"
+        variables[j] = name if name not in variables.values() else f"x{j}"
+    body = " ".join(
+        "$" + variables[j] if j in variables else word for j, word in enumerate(rows[0])
+    )
+    data = "\n".join(" ".join(row[j] for j in columns) for row in rows)
+    return (f"foreach {{{' '.join(variables.values())}}} {{\n{data}\n}} "
+            f"{{{head} {body}}}\n")
+
+
+def _commands(commands, file, loops=True):
+    # commands yields (head, names, words) tuples; consecutive commands
+    # with the same head and number of words are written together
+    batch = []
+    run   = []
+    key   = None
+
+    def flush():
+        if loops and len(run) >= LOOP:
+            batch.append(_loop(key[0], run, key[2]))
+        else:
+            batch.extend(f"{key[0]} {' '.join(row)}\n" for row in run)
+        run.clear()
+        if len(batch) >= BATCH:
+            file.write("".join(batch))
+            batch.clear()
+
+    for head, names, words in commands:
+        if (head, len(words), names) != key or len(run) == BATCH:
+            if run:
+                flush()
+            key = (head, len(words), names)
+        run.append(words)
+
+    if run:
+        flush()
+    file.write("".join(batch))
+
+
+def _element_names(words)->tuple:
+    # Name loop variables after the option that precedes them
+    return tuple(
+        words[j-1][1:] if j > 0 and words[j-1][:1] == "-" and words[j-1][1:].isidentifier()
+        else f"x{j}"
+        for j in range(len(words))
+    )
+
+
+def dump_tcl(ir: ModelIR, file=None, loops: bool=True):
+    """
+    Write a Tcl script that creates ``ir`` to ``file``.
+
+    Parameters
+    ==========
+    ir:     model to write.
+    file:   text file object; defaults to ``sys.stdout``.
+    loops:  write runs of similar commands as ``foreach`` loops.
+    """
+    if file is None:
+        file = sys.stdout
+
+    file.write(f"pragma openseespy\nmodel basic -ndm {ir.ndm} -ndf {ir.ndf}\n")
+
+    names = ("tag", "x", "y", "z")
+    _commands((
+        ("node", names, tcl_words(tag, *x))
+        for tag, x in zip(ir.node_tags.tolist(), ir.coordinates.tolist())
+    ), file, loops)
+
+    calls = []
+    for method, args, kwds in ir.calls:
+        if method == "eval":
+            calls.append(args[0].strip() + "\n")
+        else:
+            calls.append(" ".join([method, *tcl_words(*args, **kwds)]) + "\n")
+    file.write("".join(calls))
+
+    types, tags, vectors = ir.transforms
+    _commands((
+        (f"geomTransf {type}", ("tag", "x", "y", "z"),
+         tcl_words(tag, *([] if np.isnan(v[0]) else v)))
+        for type, tag, v in zip(types, tags.tolist(), vectors.tolist())
+    ), file, loops)
+
+    _commands((
+        ("fix", ("node", "dof", "dof"), [str(tag), "-dof", str(dof)]) if dof else
+        ("fix", ("node",), tcl_words(tag, *row))
+        for tag, dof, row in zip(*(a.tolist() for a in ir.fix_records))
+    ), file, loops)
+
+    _commands((
+        ("mass", ("node",), tcl_words(tag, *row))
+        for tag, row in zip(*(a.tolist() for a in ir.mass_records))
+    ), file, loops)
+
+    # Elements in the order they were added
+    def _elements():
+        names = {}
+        for block, i in ir.iter_elements():
+            words = block.words(i)
+            if id(block) not in names:
+                names[id(block)] = ("tag", *_element_names(words)[1:])
+            yield f"element {block.type}", names[id(block)], words
+
+    _commands(_elements(), file, loops)
@@ -4,4 +4,4 @@
 #
 #===----------------------------------------------------------------------===#
 from . import parser
-from .model import create_model
+from .model import create_model, create_ir
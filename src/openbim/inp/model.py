@@ -10,6 +10,7 @@ import json
 import warnings
 import numpy as np
 from openbim.convert import Converter
+from openbim.ir import ModelIR, emit
 import opensees.openseespy as ops
 
 abaqus_to_meshio_type = {
@@ -130,7 +131,11 @@ def _create_sections(ast, model, conv):
         tag = conv.define("FrameSection", "FrameSection", elset)
 
 
-def create_model(ast, verbose=False, mode=None):
+def create_ir(ast, verbose=False, mode=None):
+    """
+    Convert ``ast`` to a ``ModelIR``, and return it together with the
+    ``Converter`` of the conversion.
+    """
     if mode is None:
         mode = "simulate"
 
@@ -147,7 +152,12 @@ def create_model(ast, verbose=False, mode=None):
     # Boundaries
 #   _create_boundaries(ast, model, conv)
 
-    return model
+    return model, conv
+
+
+def create_model(ast, verbose=False, mode=None):
+    ir, conv = create_ir(ast, verbose=verbose, mode=mode)
+    return emit(ir, ops.Model(ndm=ir.ndm, ndf=ir.ndf))
 
 
 def _create_boundaries(ast, model, conv):
@@ -184,8 +194,8 @@ def _create_part(ast, verbose=False, mode=None):
     if mode is None:
         mode = "simulate"
 
-    # Create a new model
-    model = ops.Model(ndm=3, ndf=6)
+    # Collect the model in arrays; it is created in OpenSees at the end
+    model = ModelIR(ndm=3, ndf=6)
     conv = Converter()
 
     # Create Materials
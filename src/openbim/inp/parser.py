@@ -17,6 +17,8 @@ Boundary/Load: These conditions are applied to nodes or elements and don't have
 """
 
 
+from ..compressed import open_text
+
 hierarchy = {
     "root": [
         "Heading", "Preprint",
@@ -188,8 +190,12 @@ def _read_set(f, params_map):
 
 
 def load(filename, verbose=False):
+    """
+    Parse the Abaqus input file ``filename``. Files ending in ``.gz``,
+    ``.xz`` or ``.zst`` are decompressed while they are read.
+    """
 
-    with open(filename, "r") as file:
+    with open_text(filename) as file:
         root = current_node = AbaqusTable("root", child_keys=hierarchy["root"])
         stack = [current_node]
 
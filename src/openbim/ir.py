@@ -0,0 +1,461 @@
+#===----------------------------------------------------------------------===#
+#
+#         STAIRLab -- STructural Artificial Intelligence Laboratory
+#
+#===----------------------------------------------------------------------===#
+#
+"""
+Backend-neutral intermediate representation of a model.
+
+Converters build a ``ModelIR`` instead of calling an OpenSees model one
+object at a time. ``ModelIR`` accepts the same calls as
+``opensees.openseespy.Model`` (``node``, ``fix``, ``element``, ...), and
+stores nodes, constraints, masses, transformations and element
+connectivity in contiguous arrays. ``emit`` then creates the model in a
+few bulk evaluations:
+
+    >>> ir = ModelIR(ndm=3, ndf=6)
+    >>> ir.node(1, (0.0, 0.0, 0.0))
+    >>> ir.node(2, (0.0, 0.0, 3.0))
+    >>> ir.element("PrismFrame", 1, (1, 2), section=1, transform=1)
+    >>> ir.coordinates
+    array([[0., 0., 0.],
+           [0., 0., 3.]])
+    >>> model = emit(ir, ops.Model(ndm=3, ndf=6))
+
+Definitions that are not stored in arrays (materials, sections, ``eval``
+commands, ...) are kept as calls and replayed on the model in the order
+they were made.
+"""
+import sys
+from array import array
+
+import numpy as np
+
+# Number of commands evaluated at once by emit
+CHUNK = 4096
+
+
+def _is_tag(value)->bool:
+    return isinstance(value, (int, np.integer)) and not isinstance(value, bool)
+
+
+def _number(value)->str:
+    # Shortest representation that reads back to the same double
+    text = repr(float(value))
+    return text[:-2] if text.endswith(".0") else text
+
+
+def _word(value)->str:
+    if isinstance(value, (float, np.floating)):
+        return _number(value)
+    elif isinstance(value, (list, np.ndarray)):
+        return "{" + " ".join(map(_word, value)) + "}"
+    return str(value)
+
+
+def tcl_words(*args, **kwds)->list:
+    """
+    Return the Tcl words of a command with the given arguments, formed
+    as ``opensees.openseespy`` forms them: lists become braced Tcl lists,
+    tuples are spread into separate words, keyword arguments become
+    options, and floats are written in their shortest exact form.
+    """
+    words = []
+    for arg in args:
+        if isinstance(arg, tuple):
+            words.extend(map(_word, arg))
+        else:
+            words.append(_word(arg))
+    for key, value in kwds.items():
+        if isinstance(value, bool):
+            if value:
+                words.append(f"-{key.replace('_', '-')}")
+        elif isinstance(value, tuple):
+            words.append(f"-{key}")
+            words.extend(map(_word, value))
+        else:
+            words.append(f"-{key}")
+            words.append(_word(value))
+    return words
+
+
+class ElementBlock:
+    """
+    Elements of one type with the same number of nodes and the same
+    keyword arguments.
+
+    ``tags`` and ``connectivity`` are arrays with one row per element.
+    ``arguments`` holds the remaining positional arguments and keyword
+    values of each element, and ``order`` the position of each element in
+    the sequence of all elements of the model.
+    """
+    def __init__(self, type: str, nen: int, keywords: tuple, braced: bool):
+        self.type     = type
+        self.nen      = nen
+        self.keywords = keywords
+        # Whether nodes were given as a list (a Tcl list) or a tuple
+        self._braced  = braced
+        self._tags    = array("q")
+        self._nodes   = array("q")
+        self._order   = array("q")
+        self.arguments = []
+
+    def append(self, tag, nodes, args, values, order):
+        self._tags.append(tag)
+        self._nodes.extend(nodes)
+        self._order.append(order)
+        self.arguments.append((args, values))
+
+    @property
+    def tags(self)->np.ndarray:
+        return np.array(self._tags, dtype=np.int64)
+
+    @property
+    def connectivity(self)->np.ndarray:
+        return np.array(self._nodes, dtype=np.int64).reshape(-1, self.nen)
+
+    @property
+    def order(self)->np.ndarray:
+        return np.array(self._order, dtype=np.int64)
+
+    @property
+    def braced(self)->bool:
+        return self._braced
+
+    def words(self, i)->list:
+        """
+        Words of the ``element`` command of element ``i`` that follow the
+        element type.
+        """
+        nodes = self._nodes[i*self.nen:(i+1)*self.nen].tolist()
+        if self._braced:
+            head = [str(self._tags[i]), "{" + " ".join(map(str, nodes)) + "}"]
+        else:
+            head = [str(self._tags[i]), *map(str, nodes)]
+        args, values = self.arguments[i]
+        return head + tcl_words(*args, **dict(zip(self.keywords, values)))
+
+    def command(self, i)->str:
+        return f"element {self.type} " + " ".join(self.words(i))
+
+    def __len__(self):
+        return len(self._tags)
+
+    def __repr__(self):
+        return f"<ElementBlock {self.type} with {len(self)} elements>"
+
+
+class ModelIR:
+    """
+    Arrays describing a model, recorded from calls with the same
+    signatures as ``opensees.openseespy.Model``.
+
+    Parameters
+    ==========
+    ndm:  number of spatial dimensions.
+    ndf:  number of degrees of freedom per node.
+    """
+    def __init__(self, ndm: int, ndf: int):
+        self.ndm = ndm
+        self.ndf = ndf
+
+        self._node_tags   = array("q")
+        self._coordinates = array("d")
+        self._node_index  = {}
+        self._width       = None
+
+        # One row per call to fix; dof is 0 for rows given as flags
+        self._fix_nodes = array("q")
+        self._fix_dofs  = array("q")
+        self._fix_flags = array("b")
+
+        self._mass_nodes  = array("q")
+        self._mass_values = array("d")
+
+        self._transform_types   = []
+        self._transform_tags    = array("q")
+        self._transform_vectors = array("d")
+
+        # (type, nen, keywords, braced) -> ElementBlock
+        self.elements = {}
+        self._element_count = 0
+
+        # (method, args, kwds) of every other call, in order
+        self.calls = []
+
+    def _call(self, method, *args, **kwds):
+        self.calls.append((method, args, kwds))
+
+    #
+    # Model interface
+    #
+    def node(self, tag, *coordinates, **kwds):
+        if len(coordinates) == 1 and isinstance(coordinates[0], (tuple, list, np.ndarray)):
+            coordinates = coordinates[0]
+
+        if kwds or not _is_tag(tag) or (self._width is not None and len(coordinates) != self._width):
+            return self._call("node", tag, *coordinates, **kwds)
+
+        try:
+            x = [float(v) for v in coordinates]
+        except (TypeError, ValueError):
+            return self._call("node", tag, *coordinates)
+
+        self._coordinates.extend(x)
+        if self._width is None:
+            self._width = len(coordinates)
+        self._node_index.setdefault(int(tag), len(self._node_tags))
+        self._node_tags.append(tag)
+
+    def fix(self, tag, *flags, dof=None):
+        if len(flags) == 1 and isinstance(flags[0], (tuple, list, np.ndarray)):
+            flags = flags[0]
+
+        if not _is_tag(tag):
+            if dof is not None:
+                return self._call("fix", tag, *flags, dof=dof)
+            return self._call("fix", tag, tuple(flags))
+
+        if dof is not None and not flags and _is_tag(dof):
+            self._fix_nodes.append(tag)
+            self._fix_dofs.append(dof)
+            self._fix_flags.extend([0]*self.ndf)
+
+        elif dof is None and len(flags) == self.ndf and all(f in (0, 1) for f in flags):
+            self._fix_nodes.append(tag)
+            self._fix_dofs.append(0)
+            self._fix_flags.extend(map(int, flags))
+
+        elif dof is not None:
+            self._call("fix", tag, *flags, dof=dof)
+        else:
+            self._call("fix", tag, tuple(flags))
+
+    def mass(self, tag, *values):
+        if len(values) == 1 and isinstance(values[0], (tuple, list, np.ndarray)):
+            values = values[0]
+
+        if not _is_tag(tag) or len(values) != self.ndf:
+            return self._call("mass", tag, tuple(values))
+
+        try:
+            m = [float(v) for v in values]
+        except (TypeError, ValueError):
+            return self._call("mass", tag, tuple(values))
+
+        self._mass_values.extend(m)
+        self._mass_nodes.append(tag)
+
+    def geomTransf(self, type, tag, *vector):
+        if len(vector) == 1 and isinstance(vector[0], (tuple, list, np.ndarray)):
+            vector = tuple(vector[0])
+
+        if not _is_tag(tag) or len(vector) not in (0, 3):
+            return self._call("geomTransf", type, tag, *vector)
+
+        self._transform_types.append(sys.intern(type))
+        self._transform_tags.append(tag)
+        self._transform_vectors.extend(map(float, vector) if vector else (np.nan,)*3)
+
+    def element(self, type, tag, nodes, *args, **kwds):
+        if not _is_tag(tag) or not isinstance(nodes, (tuple, list, np.ndarray)) \
+                or not all(_is_tag(node) for node in nodes):
+            self._call("element", type, tag, nodes, *args, **kwds)
+            return tag
+
+        braced = isinstance(nodes, (list, np.ndarray))
+        key = (type, len(nodes), tuple(kwds), braced)
+        if key not in self.elements:
+            self.elements[key] = ElementBlock(*key)
+
+        self.elements[key].append(tag, nodes, args, tuple(kwds.values()), self._element_count)
+        self._element_count += 1
+        return tag
+
+    def material(self, *args, **kwds):
+        self._call("material", *args, **kwds)
+
+    def nDMaterial(self, *args, **kwds):
+        self._call("nDMaterial", *args, **kwds)
+
+    def uniaxialMaterial(self, *args, **kwds):
+        self._call("uniaxialMaterial", *args, **kwds)
+
+    def section(self, *args, **kwds):
+        self._call("section", *args, **kwds)
+
+    def beamIntegration(self, *args, **kwds):
+        self._call("beamIntegration", *args, **kwds)
+
+    def eval(self, command: str):
+        self._call("eval", command)
+
+    def nodeCoord(self, tag, dof: int=None):
+        i = self._node_index.get(tag, None)
+        if i is None:
+            raise KeyError(f"node {tag} has not been defined")
+        x = self._coordinates[i*self._width:(i+1)*self._width].tolist()
+        return x if dof is None else x[dof-1]
+
+    def getNodeTags(self)->list:
+        return self._node_tags.tolist()
+
+    #
+    # Arrays
+    #
+    @property
+    def node_tags(self)->np.ndarray:
+        return np.array(self._node_tags, dtype=np.int64)
+
+    @property
+    def coordinates(self)->np.ndarray:
+        """
+        Coordinates of the nodes, one row per node in ``node_tags``.
+        """
+        return np.array(self._coordinates).reshape(-1, self._width or self.ndm)
+
+    @property
+    def fixity(self)->np.ndarray:
+        """
+        Boolean matrix with one row per node in ``node_tags`` that is True
+        for every constrained degree of freedom.
+        """
+        mask  = np.zeros((len(self._node_tags), self.ndf), dtype=bool)
+        flags = np.array(self._fix_flags, dtype=bool).reshape(-1, self.ndf)
+        for tag, dof, row in zip(self._fix_nodes, self._fix_dofs, flags):
+            i = self._node_index.get(tag, None)
+            if i is None:
+                continue
+            if dof:
+                mask[i, dof-1] = True
+            else:
+                mask[i] |= row
+        return mask
+
+    @property
+    def fix_records(self)->tuple:
+        """
+        ``(nodes, dofs, flags)`` with one row for each call to ``fix``, in
+        the order of the calls. ``dofs`` holds the degree of freedom of
+        calls made with ``dof=``, and 0 for calls made with one flag per
+        degree of freedom, which are stored in the rows of ``flags``.
+        """
+        return (np.array(self._fix_nodes, dtype=np.int64),
+                np.array(self._fix_dofs, dtype=np.int64),
+                np.array(self._fix_flags, dtype=np.int64).reshape(-1, self.ndf))
+
+    @property
+    def mass_records(self)->tuple:
+        """
+        ``(nodes, values)`` with one row for each call to ``mass``, in the
+        order of the calls.
+        """
+        return (np.array(self._mass_nodes, dtype=np.int64),
+                np.array(self._mass_values).reshape(-1, self.ndf))
+
+    @property
+    def masses(self)->np.ndarray:
+        """
+        Nodal masses, one row per node in ``node_tags``.
+        """
+        masses = np.zeros((len(self._node_tags), self.ndf))
+        values = np.array(self._mass_values).reshape(-1, self.ndf)
+        for tag, row in zip(self._mass_nodes, values):
+            i = self._node_index.get(tag, None)
+            if i is not None:
+                masses[i] = row
+        return masses
+
+    @property
+    def transforms(self)->tuple:
+        """
+        ``(types, tags, vectors)`` of the geometric transformations, where
+        ``vectors`` holds the ``vecxz`` of each, or NaN when none was given.
+        """
+        return (list(self._transform_types),
+                np.array(self._transform_tags, dtype=np.int64),
+                np.array(self._transform_vectors).reshape(-1, 3))
+
+    def iter_elements(self):
+        """
+        Yield ``(block, i)`` for every element, where ``i`` is the row of
+        the element in ``block``, in the order the elements were added.
+        """
+        blocks = list(self.elements.values())
+        if not blocks:
+            return
+
+        order = np.concatenate([block.order for block in blocks])
+        which = np.concatenate([np.full(len(block), b) for b, block in enumerate(blocks)])
+        index = np.concatenate([np.arange(len(block)) for block in blocks])
+        sort  = np.argsort(order, kind="stable")
+        for b, i in zip(which[sort].tolist(), index[sort].tolist()):
+            yield blocks[b], i
+
+    def __repr__(self):
+        return (f"<ModelIR {len(self._node_tags)} nodes, {self._element_count} elements"
+                f" in {len(self.elements)} blocks, {len(self.calls)} other calls>")
+
+
+def _evaluate(model, commands, chunk):
+    buffer = []
+    for command in commands:
+        buffer.append(command)
+        if len(buffer) == chunk:
+            model.eval("\n".join(buffer))
+            buffer.clear()
+    if buffer:
+        model.eval("\n".join(buffer))
+
+
+def emit(ir: ModelIR, model, chunk: int=None):
+    """
+    Create the objects in ``ir`` in ``model``, an
+    ``opensees.openseespy.Model`` or any object with an ``eval`` method and
+    the methods of the recorded calls.
+
+    Nodes are created first, followed by the recorded calls (materials,
+    sections, ``eval`` commands, ...) in their original order, then the
+    geometric transformations, constraints, masses and finally the
+    elements in the order they were added. Objects stored in arrays are
+    sent to ``model.eval`` in scripts of ``chunk`` commands.
+
+    Returns
+    =======
+    model
+    """
+    if chunk is None:
+        chunk = CHUNK
+
+    coordinates = np.array(ir._coordinates).reshape(-1, ir._width or ir.ndm).tolist()
+    _evaluate(model, (
+        f"node {tag} " + " ".join(map(_number, x))
+        for tag, x in zip(ir._node_tags, coordinates)
+    ), chunk)
+
+    for method, args, kwds in ir.calls:
+        getattr(model, method)(*args, **kwds)
+
+    types, tags, vectors = ir.transforms
+    _evaluate(model, (
+        f"geomTransf {type} {tag}" + ("" if np.isnan(v[0]) else " " + " ".join(map(_number, v)))
+        for type, tag, v in zip(types, tags.tolist(), vectors.tolist())
+    ), chunk)
+
+    flags = np.array(ir._fix_flags, dtype=np.int64).reshape(-1, ir.ndf).tolist()
+    _evaluate(model, (
+        f"fix {tag} -dof {dof}" if dof else f"fix {tag} " + " ".join(map(str, row))
+        for tag, dof, row in zip(ir._fix_nodes, ir._fix_dofs, flags)
+    ), chunk)
+
+    masses = np.array(ir._mass_values).reshape(-1, ir.ndf).tolist()
+    _evaluate(model, (
+        f"mass {tag} " + " ".join(map(_number, row))
+        for tag, row in zip(ir._mass_nodes, masses)
+    ), chunk)
+
+    # Elements are created in the order they were added
+    _evaluate(model, (block.command(i) for block, i in ir.iter_elements()), chunk)
+
+    return model
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from openbim.csi.batch import load_many
+from openbim.csi.parse import load
+
+MODELS = Path(__file__).parents[1]/"models"
+
+FILES = [MODELS/"Tower.s2k", MODELS/"WaterTower.s2k"]
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_load_many(ordered):
+    expected = {path: load(path, cache=False) for path in FILES}
+
+    results = list(load_many(FILES, workers=2, ordered=ordered, cache=False))
+    assert all(result.error is None for result in results)
+    if ordered:
+        assert [result.path for result in results] == FILES
+    else:
+        assert sorted(result.path for result in results) == sorted(FILES)
+
+    for result in results:
+        assert result.value == expected[result.path]
+
+
+def test_load_many_errors():
+    paths = [MODELS/"Tower.s2k", MODELS/"missing.s2k"]
+    results = list(load_many(paths, workers=2, cache=False))
+    assert results[0].error is None
+    assert isinstance(results[1].error, OSError)
+
+
+def test_load_many_close():
+    # Stopping early cancels the files that have not started
+    results = load_many(FILES*4, workers=2, cache=False)
+    assert next(results).error is None
+    results.close()
+
+
+def test_load_many_lazy():
+    # Invalid options are rejected before any result is requested
+    with pytest.raises(ValueError):
+        load_many(FILES, lazy=True)
@@ -0,0 +1,47 @@
+from openbim.convert import Converter, TagMap
+
+
+def test_define_identify():
+    conv = Converter()
+    assert conv.identify("Joint", "node", "1") is None
+
+    tags = [conv.define("Joint", "node", name) for name in ("1", "2", 3)]
+    assert tags == [1, 2, 3]
+    assert conv.define("Joint", "node", "2") == 2
+    assert conv.identify("Joint", "node", 3) == 3
+
+    # Counters are shared by each type of OpenSees object
+    assert conv.define("Frame", "element", "F1") == 1
+    assert conv.define("Shell", "element", "A1") == 2
+    assert conv.define("Frame", "element") == 3
+
+    assert conv.name("Joint", "node", 2) == "2"
+    assert conv.name("Shell", "element", 2) == "A1"
+    assert conv.name("Frame", "element", 2) is None
+    assert conv.tags("Joint", "node").array.tolist() == [1, 2, 3]
+
+
+def test_tag_map_sparse():
+    tags = TagMap()
+    assert tags.add("a", 10) == 10
+    assert tags.add("a", 11) == 10
+    tags.add("b", 5)
+    tags.add("c", 10**9)
+
+    assert tags.name(5) == "b" and tags.name(10) == "a" and tags.name(10**9) == "c"
+    assert tags.name(6) is None
+    assert dict(tags.items()) == {"a": 10, "b": 5, "c": 10**9}
+    assert list(tags) == ["a", "b", "c"]
+
+
+def test_define_many():
+    conv = Converter()
+    conv.define("Joint", "node", "1")
+
+    tags = conv.define_many("Joint", "node", ["2", "1", "3", "2"])
+    assert tags.tolist() == [2, 1, 3, 2]
+    assert conv.define("Joint", "node", "4") == 4
+    assert conv.name("Joint", "node", 3) == "3"
+
+    assert conv.identify_many("Joint", "node", ["3", "5", "1"]).tolist() == [3, -1, 1]
+    assert conv.identify_many("Frame", "element", ["1"], default=0).tolist() == [0]
@@ -0,0 +1,51 @@
+import io
+import json
+
+from openbim.diagnostics import Diagnostics
+from openbim.csi.utility import UnimplementedInstance
+
+
+def test_counts_and_samples():
+    diagnostics = Diagnostics(samples=2)
+    rows = [{"Frame": str(i), "IsCurved": True} for i in range(1000)]
+    for row in rows:
+        diagnostics.record("Frame.Curve", row, "CONNECTIVITY - FRAME")
+    diagnostics.append(UnimplementedInstance("Truss", rows[0]))
+    diagnostics.append("Link.Damper")
+
+    assert diagnostics.counts == {"Frame.Curve": 1000, "Truss": 1, "Link.Damper": 1}
+    assert len(diagnostics) == 1002
+
+    # Only copies of the first rows are kept
+    samples = diagnostics.samples["Frame.Curve"]
+    assert [row for _, row in samples] == rows[:2]
+    assert samples[0][1] is not rows[0]
+
+    other = Diagnostics()
+    other.record("Frame.Curve", rows[5])
+    other.extend(diagnostics)
+    assert other.counts["Frame.Curve"] == 1001
+    assert len(other.samples["Frame.Curve"]) == 3
+
+
+def test_dump():
+    diagnostics = Diagnostics()
+    diagnostics.record("FrameSection.NPSectType", object(), "FRAME SECTION ASSIGNMENTS")
+
+    f = io.StringIO()
+    diagnostics.dump(f)
+    data = json.loads(f.getvalue())
+    assert data["total"] == 1
+    category = data["categories"]["FrameSection.NPSectType"]
+    assert category["count"] == 1
+    assert category["samples"][0]["table"] == "FRAME SECTION ASSIGNMENTS"
+
+
+def test_dump_path(tmp_path):
+    diagnostics = Diagnostics()
+    diagnostics.append("Link.Damper")
+
+    path = tmp_path/"diagnostics.json"
+    diagnostics.dump(path)
+    with open(path) as f:
+        assert json.load(f)["categories"]["Link.Damper"]["count"] == 1
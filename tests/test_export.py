@@ -0,0 +1,166 @@
+import io
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from openbim.ir import ModelIR, emit
+from openbim.export import dump_json, dump_tcl
+
+
+def _model():
+    ir = ModelIR(ndm=3, ndf=6)
+    ir.node(2, (0.0, 0.0, 3.0))
+    ir.node(1, (0.0, 0.0, 0.0))
+    ir.node(3, (1.0, 0.0, 3.0))
+    ir.fix(1, (1, 1, 1, 0, 0, 0))
+    ir.mass(3, (2.0, 2.0, 2.0, 0.0, 0.0, 0.0))
+    ir.nDMaterial("ElasticIsotropic", 1, 200.0, 0.25)
+    ir.section("FrameElastic", 1, A=1.0, Ay=0.5, Az=0.5, Iy=2.0, Iz=3.0,
+               J=4.0, E=200.0, G=80.0)
+    ir.section("ElasticShell", 2, 200.0, 0.25, 0.1)
+    ir.geomTransf("Linear", 1, (0.0, 1.0, 0.0))
+    ir.element("PrismFrame", 2, (1, 2), section=1, transform=1)
+    ir.element("ShellNLDKGT", 1, (1, 2, 3), 2)
+    return ir
+
+
+def test_dump_json():
+    file = io.StringIO()
+    dump_json(_model(), file)
+    model = json.loads(file.getvalue().replace("\t", " "))["StructuralAnalysisModel"]
+
+    properties = model["properties"]
+    assert [s["type"] for s in properties["sections"]] == [
+        "ElasticFrameSection3d", "ElasticMembranePlateSection"
+    ]
+    assert properties["sections"][0]["Ca"] == 1.0
+    assert properties["nDMaterials"][0]["name"] == "1"
+    assert properties["crdTransformations"][0]["vecxz"] == [0, 1, 0]
+
+    geometry = model["geometry"]
+    assert [n["name"] for n in geometry["nodes"]] == [1, 2, 3]
+    assert geometry["nodes"][2]["mass"] == [2, 2, 2, 0, 0, 0]
+    assert [e["type"] for e in geometry["elements"]] == ["ShellNLDKGT", "PrismFrame3d"]
+    frame = geometry["elements"][1]
+    assert frame["G"] == 40.0 and frame["Jx"] == 8.0
+    assert [(c["node"], c["dof"]) for c in geometry["constraints"]] == [(1, 1), (1, 2), (1, 3)]
+
+
+def test_unsupported():
+    ir = _model()
+    ir.element("ForceFrame", 3, (2, 3), section=1, transform=1)
+    file = io.StringIO()
+    with pytest.raises(NotImplementedError):
+        dump_json(ir, file)
+    # Nothing is written for models that must be printed by OpenSees
+    assert file.getvalue() == ""
+
+
+def test_dump_tcl():
+    ir = ModelIR(ndm=3, ndf=6)
+    for i in range(5):
+        ir.node(i+1, (float(i), 0.0, 3.0))
+    ir.fix(1, (1, 1, 1, 1, 1, 1))
+    ir.section("FrameElastic", 1, A=1.0, E=200.0)
+    for i in range(4):
+        ir.element("PrismFrame", i+1, (i+1, i+2), section=1, transform=1)
+
+    file = io.StringIO()
+    dump_tcl(ir, file)
+    assert file.getvalue().splitlines() == [
+        "pragma openseespy",
+        "model basic -ndm 3 -ndf 6",
+        "foreach {tag x} {",
+        "1 0", "2 1", "3 2", "4 3", "5 4",
+        "} {node $tag $x 0 3}",
+        "section FrameElastic 1 -A 1 -E 200",
+        "fix 1 1 1 1 1 1 1",
+        "foreach {tag x1 x2} {",
+        "1 1 2", "2 2 3", "3 3 4", "4 4 5",
+        "} {element PrismFrame $tag $x1 $x2 -section 1 -transform 1}",
+    ]
+
+    file = io.StringIO()
+    dump_tcl(ir, file, loops=False)
+    assert "element PrismFrame 4 4 5 -section 1 -transform 1\n" in file.getvalue()
+    assert "foreach" not in file.getvalue()
+
+
+MODELS = Path(__file__).parents[1]/"models"/"Analysis"
+
+
+def _canonical(text):
+    # Properties are compared by name, since OpenSees lists them in the
+    # order of its hash tables; constraint names come from a global counter
+    model = json.loads(text.replace("\t", " "))["StructuralAnalysisModel"]
+    for key, value in model["properties"].items():
+        if isinstance(value, list):
+            model["properties"][key] = {json.dumps(item["name"]): item for item in value}
+    for constraint in model["geometry"]["constraints"]:
+        constraint["name"] = None
+    return model
+
+
+def _print_json(ir, path):
+    import opensees.openseespy as ops
+    model = emit(ir, ops.Model(ndm=ir.ndm, ndf=ir.ndf))
+    model.print("-json", "-file", str(path))
+    return path.read_text()
+
+
+@pytest.mark.parametrize("name", [
+    "Example 1-001.s2k",       # PrismFrame
+    "Example 2-001-thin.s2k",  # ShellMITC4
+    "Example 2-002d-thin.s2k", # ShellNLDKGT
+])
+def test_dump_json_print(name, tmp_path):
+    pytest.importorskip("opensees")
+    from openbim.csi import load, create_ir
+
+    ir, _ = create_ir(load(MODELS/name, cache=False))
+    file = io.StringIO()
+    dump_json(ir, file)
+    assert _canonical(file.getvalue()) == _canonical(_print_json(ir, tmp_path/"model.json"))
+
+
+def test_fallback(tmp_path):
+    pytest.importorskip("opensees")
+    from openbim.csi import load, create_ir
+
+    # Has a frame section with no shear area, which dump_json does not write
+    file = MODELS/"Example 1-021.s2k"
+    ir, _ = create_ir(load(file, cache=False))
+    with pytest.raises(NotImplementedError):
+        dump_json(ir, io.StringIO())
+
+    # -C falls back to printing the model with OpenSees
+    output = subprocess.run([sys.executable, "-m", "openbim.csi", "-C", str(file)],
+                            capture_output=True, text=True, check=True).stdout
+    assert _canonical(output) == _canonical(_print_json(ir, tmp_path/"model.json"))
+
+
+def test_dump_tcl_emit():
+    # Without loops, the script has the same commands that emit evaluates
+    class Recorder:
+        def __init__(self):
+            self.commands = []
+
+        def eval(self, script):
+            self.commands.extend(script.split("\n"))
+
+    ir = ModelIR(ndm=3, ndf=6)
+    ir.node(1, (0.0, 0.0, 0.0))
+    ir.node(2, (0.5, 1e-20, 3.0))
+    ir.fix(1, (1, 1, 1, 1, 1, 1))
+    ir.fix(2, dof=3)
+    ir.mass(2, (0.1, 0.1, 0.1, 0.0, 0.0, 0.0))
+    ir.geomTransf("Linear", 1, (0.0, -1.0, 0.0))
+    ir.element("ShellMITC4", 2, [1, 2, 2, 1], 1)
+    ir.element("PrismFrame", 1, (1, 2), section=1, transform=1, mass=2.5)
+
+    file = io.StringIO()
+    dump_tcl(ir, file, loops=False)
+    assert file.getvalue().splitlines()[2:] == emit(ir, Recorder()).commands
@@ -0,0 +1,94 @@
+import numpy as np
+
+from openbim.ir import ModelIR
+from openbim.convert import Converter
+from openbim.csi import _frame
+from openbim.csi._frame import add_frames
+
+
+def _csi(frames, angles=None):
+    if angles is None:
+        angles = [0.0]*len(frames)
+    return {
+        "CONNECTIVITY - FRAME": [
+            {"Frame": name, "JointI": i, "JointJ": j} for name, i, j in frames
+        ],
+        "FRAME SECTION ASSIGNMENTS": [
+            {"Frame": name, "AnalSect": "S1"} for name, _, _ in frames
+        ],
+        "FRAME SECTION PROPERTIES 01 - GENERAL": [
+            {"SectionName": "S1", "Shape": "Rectangular", "Material": "M1", "Area": 1.0}
+        ],
+        "MATERIAL PROPERTIES 02 - BASIC MECHANICAL PROPERTIES": [
+            {"Material": "M1", "UnitMass": 0.1}
+        ],
+        "FRAME LOCAL AXES ASSIGNMENTS 1 - TYPICAL": [
+            {"Frame": name, "Angle": angle} for (name, _, _), angle in zip(frames, angles)
+        ],
+    }
+
+
+def _convert(csi, joints, ndm=3):
+    ndf = 6 if ndm == 3 else 3
+    ir   = ModelIR(ndm=ndm, ndf=ndf)
+    conv = Converter()
+    for name, x in joints.items():
+        ir.node(conv.define("Joint", "node", name), x)
+    conv.define("AnalSect", "section", "S1")
+
+    add_frames(csi, ir, {}, {"ndm": ndm}, conv)
+
+    block, = ir.elements.values()
+    transforms = [dict(zip(block.keywords, values))["transform"]
+                  for _, values in block.arguments]
+    return ir, transforms
+
+
+def test_shared_transforms():
+    joints = {"1": (0., 0., 0.), "2": (0., 0., 3.),
+              "3": (5., 0., 0.), "4": (5., 0., 3.)}
+    # A rotation of 360 degrees gives the same vecxz up to rounding
+    csi = _csi([("C1", "1", "2"), ("C2", "3", "4"), ("B1", "2", "4"), ("C3", "3", "4")],
+               [0.0, 0.0, 0.0, 360.0])
+    ir, transforms = _convert(csi, joints)
+
+    types, tags, vectors = ir.transforms
+    # Parallel columns share a transformation; the beam has its own
+    assert transforms == [1, 1, 2, 1]
+    assert tags.tolist() == [1, 2]
+
+
+def test_negative_zero(monkeypatch):
+    joints = {"1": (0., 0., 0.), "2": (0., 0., 3.), "3": (5., 0., 0.)}
+    vectors = [np.array([0.0, 1.0, 0.0]), np.array([-0.0, 1.0, 0.0])]
+    monkeypatch.setattr(_frame, "_orient", lambda xi, xj, angle: vectors[int(angle)])
+
+    ir, transforms = _convert(_csi([("F1", "1", "2"), ("F2", "1", "3")], [0, 1]), joints)
+    assert transforms == [1, 1]
+    assert len(ir.transforms[1]) == 1
+
+
+def test_2d():
+    joints = {"1": (0., 0.), "2": (0., 3.), "3": (5., 3.)}
+    ir, transforms = _convert(_csi([("C1", "1", "2"), ("B1", "2", "3")]), joints, ndm=2)
+
+    types, tags, vectors = ir.transforms
+    assert transforms == [1, 1]
+    assert tags.tolist() == [1] and np.isnan(vectors[0]).all()
+
+
+def test_zero_length():
+    joints = {"1": (0., 0., 0.), "2": (0., 0., 0.), "3": (0., 0., 3.)}
+    csi = _csi([("F1", "1", "2"), ("F2", "1", "3")])
+    ir   = ModelIR(ndm=3, ndf=6)
+    conv = Converter()
+    for name, x in joints.items():
+        ir.node(conv.define("Joint", "node", name), x)
+    conv.define("AnalSect", "section", "S1")
+
+    add_frames(csi, ir, {}, {"ndm": 3}, conv)
+
+    # The skipped frame is reported through the converter
+    assert conv.diagnostics.counts == {"Frame.ZeroLength": 1}
+    (table, row), = conv.diagnostics.samples["Frame.ZeroLength"]
+    assert table == "CONNECTIVITY - FRAME" and row["Frame"] == "F1"
@@ -0,0 +1,86 @@
+import numpy as np
+
+from openbim.ir import ModelIR, emit
+
+
+class Recorder:
+    def __init__(self):
+        self.commands = []
+
+    def eval(self, script):
+        self.commands.extend(script.split("\n"))
+
+    def section(self, *args, **kwds):
+        self.commands.append(("section", args, kwds))
+
+
+def _model():
+    ir = ModelIR(ndm=3, ndf=6)
+    ir.node(1, (0.0, 0.0, 0.0))
+    ir.node(2, 0, 0, 3)
+    ir.node(3, (1.0, 0.0, 3.0))
+    ir.fix(1, (1, 1, 1, 1, 1, 1))
+    ir.fix(2, dof=3)
+    ir.mass(3, (1.0, 1.0, 1.0, 0.0, 0.0, 0.0))
+    ir.section("FrameElastic", 1, E=1.0)
+    ir.geomTransf("Linear", 1, 1.0, 0.0, 0.0)
+    ir.geomTransf("Linear", 2, (0.0, 1.0, 0.0))
+    ir.element("PrismFrame", 1, (1, 2), section=1, transform=1)
+    ir.element("ShellMITC4", 2, (1, 2, 3, 3), 1)
+    ir.element("PrismFrame", 3, (2, 3), section=1, transform=2)
+    return ir
+
+
+def test_arrays():
+    ir = _model()
+    assert ir.node_tags.tolist() == [1, 2, 3]
+    assert ir.coordinates.shape == (3, 3)
+    assert ir.nodeCoord(2) == [0.0, 0.0, 3.0]
+
+    fixity = ir.fixity
+    assert fixity[0].all() and fixity[1].tolist() == [False, False, True, False, False, False]
+    assert not fixity[2].any()
+    assert ir.masses[2, 0] == 1.0
+
+    nodes, dofs, flags = ir.fix_records
+    assert nodes.tolist() == [1, 2] and dofs.tolist() == [0, 3]
+    assert flags[0].all() and not flags[1].any()
+    nodes, values = ir.mass_records
+    assert nodes.tolist() == [3] and values.tolist() == [[1, 1, 1, 0, 0, 0]]
+
+    types, tags, vectors = ir.transforms
+    assert types == ["Linear", "Linear"] and tags.tolist() == [1, 2]
+    assert np.allclose(vectors, [[1, 0, 0], [0, 1, 0]])
+
+    blocks = {block.type: block for block in ir.elements.values()}
+    assert blocks["PrismFrame"].connectivity.tolist() == [[1, 2], [2, 3]]
+    assert blocks["ShellMITC4"].tags.tolist() == [2]
+    assert ir.calls == [("section", ("FrameElastic", 1), {"E": 1.0})]
+
+
+def test_emit():
+    model = emit(_model(), Recorder(), chunk=2)
+    assert model.commands == [
+        "node 1 0 0 0",
+        "node 2 0 0 3",
+        "node 3 1 0 3",
+        ("section", ("FrameElastic", 1), {"E": 1.0}),
+        "geomTransf Linear 1 1 0 0",
+        "geomTransf Linear 2 0 1 0",
+        "fix 1 1 1 1 1 1 1",
+        "fix 2 -dof 3",
+        "mass 3 1 1 1 0 0 0",
+        "element PrismFrame 1 1 2 -section 1 -transform 1",
+        "element ShellMITC4 2 1 2 3 3 1",
+        "element PrismFrame 3 2 3 -section 1 -transform 2",
+    ]
+
+
+def test_unsupported_calls():
+    # Objects that cannot be stored in arrays are kept as calls
+    ir = ModelIR(ndm=3, ndf=6)
+    ir.node(1, (0.0, 0.0, 0.0))
+    ir.fix(None, (1, 1, 1, 0, 0, 0))
+    ir.element("ShellMITC4", 1, (1, None, 2, 3), 1)
+    assert [call[0] for call in ir.calls] == ["fix", "element"]
+    assert len(ir.elements) == 0
@@ -0,0 +1,300 @@
+import shlex
+from pathlib import Path
+
+import pytest
+
+from openbim.csi import cache, parse
+from openbim.csi.parse import _split, load, iter_rows
+
+MODELS = Path(__file__).parents[1]/"models"
+
+CORPUS = sorted(
+    file for ext in ("s2k", "b2k") for file in MODELS.rglob(f"*.{ext}")
+)
+
+
+def _split_shlex(line):
+    # Reference tokenizer; this is what load() used before _split
+    lex = shlex.shlex(line, posix=True)
+    lex.quotes = '"'
+    lex.wordchars += "'"
+    lex.whitespace_split = True
+    return list(lex)
+
+
+def _tokens(split, line):
+    try:
+        return split(line)
+    except ValueError as e:
+        return ("error", str(e))
+
+
+@pytest.mark.parametrize("line", [
+    'Key=Val   Other=1\n',
+    'Grade="f\'c 4000 psi"   Notes="a b"\n',
+    "Material=A'   Fy=50 _\n",
+    'FileName="W:\\DEVEL\\Sections8.pro"   GUID=x\n',
+    'RebarID=#2   Area=0.05\n',
+    'Key="a#b"   Key="a\\"b"   Key=a\\ b\n',
+    'Key=""   ""\n',
+    'Key=a\tb\x0bc\n',
+    'Key="unterminated\n',
+    'Key=escape\\',
+])
+def test_split_quoting(line):
+    assert _tokens(_split, line) == _tokens(_split_shlex, line)
+
+
+@pytest.mark.parametrize("file", CORPUS, ids=lambda p: p.name)
+def test_split_corpus(file):
+    with open(file, "r") as f:
+        for line in f:
+            assert _tokens(_split, line) == _tokens(_split_shlex, line), line
+
+
+@pytest.mark.parametrize("file", CORPUS, ids=lambda p: p.name)
+def test_lazy_corpus(file):
+    with open(file, "r") as f:
+        tables = load(f)
+
+    lazy = load(file, lazy=True, cache=False)
+    assert list(lazy) == list(tables)
+    assert all(name in lazy for name in tables)
+    assert dict(lazy) == tables
+
+
+@pytest.mark.parametrize("file", CORPUS, ids=lambda p: p.name)
+def test_mapped_corpus(file):
+    skip = {"PROGRAM CONTROL", "JOINT COORDINATES"}
+    with open(file, "r") as f:
+        tables = load(f, skip=skip)
+
+    assert load(file, skip=skip, cache=False) == tables
+    assert not skip & set(tables)
+
+
+@pytest.mark.parametrize("mapped", [False, True])
+def test_interned(mapped):
+    file = MODELS/"Tower.s2k"
+    if mapped:
+        tables = load(file, cache=False)
+    else:
+        with open(file, "r") as f:
+            tables = load(f)
+
+    rows = tables["JOINT COORDINATES"]
+    # Repeated keys and string values share one object
+    assert rows[0]["CoordSys"] == rows[1]["CoordSys"] == "GLOBAL"
+    assert rows[0]["CoordSys"] is rows[1]["CoordSys"]
+    assert all(a is b for a, b in zip(rows[0], rows[1]))
+
+
+@pytest.mark.parametrize("file", CORPUS[::10], ids=lambda p: p.name)
+def test_columnar_rows(file):
+    tables  = load(file, cache=False)
+    columns = load(file, columnar=True, cache=False)
+
+    assert list(columns) == list(tables)
+    for name, table in tables.items():
+        assert list(columns[name]) == table
+        assert columns[name][-1:] == table[-1:]
+
+
+def test_cache(tmp_path, monkeypatch):
+    monkeypatch.setitem(cache._CONFIG, "directory", tmp_path)
+    file = MODELS/"Tower.s2k"
+
+    tables = load(file, cache=True)
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+    assert load(file, cache=True) == tables
+
+    load(file, columnar=True, cache=True)
+    assert len(list(tmp_path.glob("*.pickle"))) == 2
+
+    cache.clear()
+    assert not list(tmp_path.glob("*.pickle"))
+
+
+def test_cache_lazy(tmp_path, monkeypatch):
+    monkeypatch.setitem(cache._CONFIG, "directory", tmp_path)
+    monkeypatch.setitem(cache._CONFIG, "enabled", True)
+    file = MODELS/"Tower.s2k"
+
+    tables = load(file)
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+    # Lazy loads are not served from the cache
+    lazy = load(file, lazy=True)
+    assert isinstance(lazy, parse.LazyTables)
+    assert dict(lazy) == tables
+    lazy.close()
+    assert len(list(tmp_path.glob("*.pickle"))) == 1
+
+
+def test_cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.setitem(cache._CONFIG, "directory", tmp_path)
+    monkeypatch.setitem(cache._CONFIG, "enabled", False)
+    load(MODELS/"Tower.s2k")
+    assert not list(tmp_path.glob("*.pickle"))
+
+
+def test_cache_default(monkeypatch):
+    # Unless OPENBIM_CACHE is set, the caller chooses
+    monkeypatch.setitem(cache._CONFIG, "enabled", None)
+    assert not cache.enabled()
+    assert cache.enabled(default=True)
+
+    cache.configure(enabled=False)
+    assert not cache.enabled(default=True)
+
+
+@pytest.mark.parametrize("file", [MODELS/"Tower.s2k", MODELS/"csi"/"painter"/"Painter_Street_v1.2.b2k"],
+                         ids=lambda p: p.name)
+def test_iter_rows(file):
+    tables = load(file, cache=False)
+    for name in ("JOINT COORDINATES", "FRAME SECTION PROPERTIES 01 - GENERAL",
+                 "OVERWRITES - STEEL DESIGN - AISC 360-16"):
+        assert list(iter_rows(file, name)) == tables.get(name, [])
+
+
+@pytest.mark.parametrize("value", [
+    "1", "-2", "01", "1.5", "1E-05", "-.5", "1_0", "+1", "Yes", "No", "true",
+    "null", "NaN", "-Infinity", "GLOBAL", "9f6f617c-d964", "", " 1", '"q"', "[1,2]",
+])
+def test_typed_decoders(value):
+    expected = parse._parse_value(value)
+    for decode in set(parse._DECODERS.values()):
+        assert repr(decode(value)) == repr(expected)
+
+
+@pytest.mark.parametrize("file", CORPUS[::10], ids=lambda p: p.name)
+def test_typed_corpus(file, monkeypatch):
+    tables = load(file, cache=False)
+    monkeypatch.setattr(parse, "_decoders", lambda name: {})
+    # repr() also distinguishes 1 from 1.0 and True
+    assert repr(load(file, cache=False)) == repr(tables)
+
+
+def test_reload_diff(tmp_path):
+    from openbim.csi.diff import reload
+
+    text = (MODELS/"Tower.s2k").read_text()
+    file = tmp_path/"Tower.s2k"
+    file.write_text(text)
+    tables, digests, diff = reload({}, {}, file)
+    assert diff.added == list(tables) and not diff.changed
+
+    file.write_text(text.replace("Frame=2   SectionType=\"I/Wide Flange\"   AutoSelect=N.A.   AnalSect=FSEC1",
+                                 "Frame=2   SectionType=\"I/Wide Flange\"   AutoSelect=N.A.   AnalSect=FSEC2"))
+    updated, _, diff = reload(tables, digests, file)
+
+    assert updated == load(file, cache=False)
+    assert list(diff.changed) == ["FRAME SECTION ASSIGNMENTS"]
+    (old, new), = diff.changed["FRAME SECTION ASSIGNMENTS"].changed
+    assert old["AnalSect"] == "FSEC1" and new["AnalSect"] == "FSEC2"
+    assert updated["JOINT COORDINATES"] is tables["JOINT COORDINATES"]
+
+
+@pytest.mark.parametrize("suffix", [".gz", ".xz"])
+def test_compressed(tmp_path, suffix):
+    import gzip, lzma
+    compress = {".gz": gzip.compress, ".xz": lzma.compress}[suffix]
+
+    expected = load(MODELS/"Tower.s2k", cache=False)
+    file = tmp_path/("Tower.s2k" + suffix)
+    file.write_bytes(compress((MODELS/"Tower.s2k").read_bytes()))
+
+    assert load(file, cache=False) == expected
+
+    lazy = load(file, lazy=True, cache=False)
+    # Access tables out of order to exercise reopening the stream
+    for name in reversed(list(expected)):
+        assert lazy[name] == expected[name]
+    lazy.close()
+
+    assert list(iter_rows(file, "JOINT COORDINATES")) == expected["JOINT COORDINATES"]
+
+
+@pytest.mark.parametrize("file", CORPUS[::10])
+def test_dump_round_trip(file, tmp_path):
+    from openbim.csi.write import dump
+
+    tables = load(file, cache=False)
+    dump(tables, tmp_path/"model.s2k")
+    assert load(tmp_path/"model.s2k", cache=False) == tables
+
+
+def test_dump_update(tmp_path):
+    from openbim.csi.write import dump
+
+    file = tmp_path/"Tower.s2k"
+    file.write_bytes((MODELS/"Tower.s2k").read_bytes())
+    original = load(file, cache=False)
+
+    tables = load(file, lazy=True, cache=False)
+    for row in tables["FRAME SECTION ASSIGNMENTS"]:
+        row["AnalSect"] = "FSEC2"
+    tables["NEW TABLE"] = [{"Name": "1", "Value": 1.5, "Note": 'say "hi"'}]
+    dump(tables, file, update=True)
+    tables.close()
+
+    updated = load(file, cache=False)
+    assert list(updated) == list(original) + ["NEW TABLE"]
+    assert updated["NEW TABLE"] == [{"Name": "1", "Value": 1.5, "Note": 'say "hi"'}]
+    assert all(row["AnalSect"] == "FSEC2" for row in updated["FRAME SECTION ASSIGNMENTS"])
+    assert updated["JOINT COORDINATES"] == original["JOINT COORDINATES"]
+
+    # Tables that were not rewritten keep their original text
+    text = (MODELS/"Tower.s2k").read_bytes()
+    start = text.index(b'TABLE:  "JOINT COORDINATES"')
+    stop  = text.index(b"TABLE:", start + 1)
+    assert text[start:stop] in file.read_bytes()
+
+
+def test_load_results(tmp_path):
+    from openbim.csi.results import load_results, iter_results
+
+    file = tmp_path/"results.xml"
+    file.write_text("""<?xml version="1.0" standalone="yes"?>
+<NewDataSet>
+  <xs:schema id="NewDataSet" xmlns="" xmlns:xs="http://www.w3.org/2001/XMLSchema">
+    <xs:element name="NewDataSet">
+      <xs:complexType>
+        <xs:choice minOccurs="0" maxOccurs="unbounded">
+          <xs:element name="Joint_x0020_Displacements">
+            <xs:complexType>
+              <xs:sequence>
+                <xs:element name="Joint" type="xs:string" minOccurs="0" />
+                <xs:element name="OutputCase" type="xs:string" minOccurs="0" />
+                <xs:element name="U1" type="xs:double" minOccurs="0" />
+              </xs:sequence>
+            </xs:complexType>
+          </xs:element>
+        </xs:choice>
+      </xs:complexType>
+    </xs:element>
+  </xs:schema>
+  <Joint_x0020_Displacements>
+    <Joint>1</Joint>
+    <OutputCase>DEAD</OutputCase>
+    <U1>0</U1>
+  </Joint_x0020_Displacements>
+  <Joint_x0020_Displacements>
+    <Joint>2</Joint>
+    <OutputCase>DEAD</OutputCase>
+    <U1>-1.5E-03</U1>
+  </Joint_x0020_Displacements>
+  <Program_x0020_Control>
+    <ProgramName>SAP2000</ProgramName>
+    <Version>25</Version>
+  </Program_x0020_Control>
+</NewDataSet>
+""")
+    results = load_results(file)
+    assert list(results) == ["Joint Displacements", "Program Control"]
+    assert results["Joint Displacements"].column("U1").tolist() == [0.0, -1.5e-3]
+    assert list(results["Joint Displacements"])[1] == {"Joint": "2", "OutputCase": "DEAD", "U1": -1.5e-3}
+    assert list(results["Program Control"]) == [{"ProgramName": "SAP2000", "Version": 25}]
+
+    assert list(iter_results(file, "Program Control")) == [{"ProgramName": "SAP2000", "Version": 25}]
+    assert list(load_results(file, tables={"Program Control"}, columnar=False)) == ["Program Control"]
@@ -0,0 +1,107 @@
+from pathlib import Path
+
+import pytest
+
+from openbim.csi.parse import load
+from openbim.csi.tables import Tables
+from openbim.csi.utility import find_row, find_rows
+
+MODELS = Path(__file__).parents[1]/"models"
+
+
+@pytest.mark.parametrize("file", [MODELS/"Tower.s2k", MODELS/"WaterTower.s2k"])
+def test_find_indexed(file):
+    csi    = load(file, cache=False)
+    tables = Tables(csi)
+
+    for name, rows in csi.items():
+        if not rows:
+            continue
+        column = next(iter(rows[0]))
+        for row in rows[:50]:
+            value = row[column]
+            assert find_row(tables[name], **{column: value}) is find_row(rows, **{column: value})
+            assert find_rows(tables[name], **{column: value}) == find_rows(rows, **{column: value})
+            assert find_rows(tables[name], **row) == find_rows(rows, **row)
+
+        assert find_row(tables[name], **{column: "missing value"}) is None
+        assert find_rows(tables[name], NoSuchColumn=1) == []
+
+
+def test_index_updates():
+    rows   = [{"Frame": 1, "Section": "A"}, {"Frame": 2, "Section": "B"}, {"Frame": 3}]
+    tables = Tables({"FRAMES": rows})
+
+    assert tables.find("FRAMES", Section="B") is rows[1]
+    assert tables.all("FRAMES", Frame=1.0) == [rows[0]]
+    assert tables.find("MISSING", _default={}, Frame=1) == {}
+    assert not tables.any("FRAMES", Section="C")
+
+    # Appending rows invalidates the index
+    rows.append({"Frame": 4, "Section": "C"})
+    assert tables.any("FRAMES", Section="C")
+
+    # Unhashable values are found by scanning
+    rows.append({"Frame": 5, "Section": ["D"]})
+    assert tables.find("FRAMES", Section=["D"]) is rows[-1]
+
+
+def test_group_arrays():
+    from openbim.csi.tables import Table
+
+    rows = [
+        {"SectionName": "A", "Polygon": 1, "X": 0, "Y": 0, "Opening": False},
+        {"SectionName": "A", "Polygon": 1, "X": 1, "Y": 0},
+        {"SectionName": "A", "Polygon": 2, "X": 0, "Y": 1, "Opening": True},
+        {"SectionName": "B", "Polygon": 2, "X": 5, "Y": 5, "Opening": True},
+        {"SectionName": "A", "Polygon": 1, "X": 1, "Y": 1},
+    ]
+    table = Table(rows)
+
+    groups = table.group("SectionName", "Polygon")
+    assert groups[("A", 1)] == [rows[0], rows[1], rows[4]]
+    assert groups[("B", 2)] == [rows[3]]
+
+    vertices = table.arrays(("SectionName", "Polygon"), ("X", "Y"))
+    assert vertices[("A", 1)].tolist() == [[0, 0], [1, 0], [1, 1]]
+    assert vertices[("A", 2)].flags.c_contiguous
+    assert not vertices[("A", 2)].flags.writeable
+    assert table.arrays(("SectionName", "Polygon"), ("X", "Y")) is vertices
+
+
+def test_frame_records():
+    from openbim.csi._frame.records import frame_records
+
+    csi     = load(MODELS/"Tower.s2k", cache=False)
+    tables  = Tables(csi)
+    records = frame_records(tables)
+    assert frame_records(tables) is records
+
+    frames = csi["CONNECTIVITY - FRAME"]
+    assert len(records) == len(frames)
+    for i, frame in enumerate(frames):
+        assert records.index(frame["Frame"]) == i
+        assign   = find_row(csi["FRAME SECTION ASSIGNMENTS"], Frame=frame["Frame"])
+        section  = find_row(csi["FRAME SECTION PROPERTIES 01 - GENERAL"], SectionName=assign["AnalSect"])
+        material = find_row(csi["MATERIAL PROPERTIES 02 - BASIC MECHANICAL PROPERTIES"], Material=section["Material"])
+        assert records.section[i] == assign["AnalSect"]
+        assert records.self_mass[i] == section["Area"]*material["UnitMass"]
+        assert records.E[i] == material["E1"]
+        release  = find_row(csi["FRAME RELEASE ASSIGNMENTS 1 - GENERAL"], Frame=frame["Frame"])
+        assert records.truss[i] == bool(release and all(release[k] for k in ("TI", "M2I", "M3I", "M2J", "M3J")))
+
+
+def test_profile():
+    from openbim.csi.tables import profile, active_profile
+
+    rows = [{"Frame": i} for i in range(10)]
+    tables = Tables({"FRAMES": rows})
+    with profile() as stats:
+        for i in range(5):
+            find_row(tables["FRAMES"], Frame=i)
+        find_row(rows, Frame=3)
+
+    assert active_profile() is not stats
+    count, scanned, _ = stats.stats[("FRAMES", ("Frame",))]
+    assert count == 5 and scanned == len(rows)
+    assert stats.stats[(None, ("Frame",))][:2] == [1, 4]